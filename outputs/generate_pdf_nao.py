@@ -5,27 +5,78 @@ Générateur de rapport PDF pour les NAO - CFTC
 Génère un PDF professionnel avec tous les arguments et données clés pour les négociations.
 
 Usage:
-    python generate_pdf_nao.py [data.json] [output.pdf]
+    python generate_pdf_nao.py [data.json] [output.pdf] [--workers=N]
+    python generate_pdf_nao.py a.json b.json [...] dossier_sortie/ [--workers=N]
     
 Si aucun argument, utilise /mnt/user-data/public/data.json et génère rapport_nao.pdf
+Avec plusieurs fichiers de données, un rapport rapport_nao_<nom>.pdf est généré
+pour chacun dans le dossier de sortie, en parallèle (suffixe _2, _3... si deux
+fichiers portent le même nom).
 """
 
+import functools
+import heapq
+import io
 import json
+import math
+import os
 import sys
-from datetime import datetime
+import threading
+from datetime import date, datetime
+from operator import itemgetter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm, mm
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
+    SimpleDocTemplate, Paragraph, Spacer, Flowable,
     PageBreak, Image, HRFlowable
 )
+from reportlab.pdfbase import pdfmetrics
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 
+try:
+    import orjson
+except ImportError:  # parseur natif absent → module json standard
+    orjson = None
+
+
+# Palette du rapport (couleurs parsées une seule fois à l'import)
+BLEU_CFTC = colors.HexColor('#1e40af')
+BLEU_NUIT = colors.HexColor('#1e3a8a')
+BLEU_VIF = colors.HexColor('#3b82f6')
+BLEU_PALE = colors.HexColor('#eff6ff')
+VERT = colors.HexColor('#059669')
+GRIS_FONCE = colors.HexColor('#334155')
+GRIS_TEXTE = colors.HexColor('#475569')
+GRIS_MOYEN = colors.HexColor('#64748b')
+GRIS_CLAIR = colors.HexColor('#94a3b8')
+GRIS_LIGNE = colors.HexColor('#cbd5e1')
+GRIS_BORDURE = colors.HexColor('#e2e8f0')
+FOND_CLAIR = colors.HexColor('#f8fafc')
+
+# Polices des tableaux dessinés sur le canvas, résolues une seule fois
+POLICE = pdfmetrics.getFont('Helvetica')
+POLICE_GRAS = pdfmetrics.getFont('Helvetica-Bold')
+
+# Valeur affichée dans une cellule quand la donnée manque
+NON_DISPONIBLE = '-'
+
+# Tableau des prévisions Banque de France
+ANNEES_BDF = ('2024', '2025', '2026', '2027')
+INDICATEURS_BDF = (
+    ('pib_croissance', 'PIB (%)'),
+    ('inflation_ipch', 'Inflation IPCH (%)'),
+    ('taux_chomage', 'Chômage (%)'),
+    ('salaires_nominaux', 'Salaires nominaux (%)'),
+)
+
 
 def load_data(filepath):
-    """Charge les données JSON"""
+    """Charge les données JSON (orjson si disponible)"""
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
@@ -39,7 +90,7 @@ def create_styles():
         name='TitreRapport',
         parent=styles['Title'],
         fontSize=24,
-        textColor=colors.HexColor('#1e40af'),
+        textColor=BLEU_CFTC,
         spaceAfter=20,
         alignment=TA_CENTER
     ))
@@ -49,7 +100,7 @@ def create_styles():
         name='SousTitre',
         parent=styles['Normal'],
         fontSize=14,
-        textColor=colors.HexColor('#475569'),
+        textColor=GRIS_TEXTE,
         spaceAfter=30,
         alignment=TA_CENTER
     ))
@@ -59,10 +110,10 @@ def create_styles():
         name='TitreSection',
         parent=styles['Heading1'],
         fontSize=16,
-        textColor=colors.HexColor('#1e40af'),
+        textColor=BLEU_CFTC,
         spaceBefore=20,
         spaceAfter=10,
-        borderColor=colors.HexColor('#1e40af'),
+        borderColor=BLEU_CFTC,
         borderWidth=0,
         borderPadding=5
     ))
@@ -72,7 +123,7 @@ def create_styles():
         name='TitreSousSection',
         parent=styles['Heading2'],
         fontSize=13,
-        textColor=colors.HexColor('#334155'),
+        textColor=GRIS_FONCE,
         spaceBefore=15,
         spaceAfter=8
     ))
@@ -86,14 +137,21 @@ def create_styles():
         alignment=TA_JUSTIFY
     ))
     
+    # Élément de liste (l'espacement remplace un Spacer après chaque puce)
+    styles.add(ParagraphStyle(
+        name='Puce',
+        parent=styles['TexteNormal'],
+        spaceAfter=5
+    ))
+    
     # Argument NAO (encadré)
     styles.add(ParagraphStyle(
         name='ArgumentNAO',
         parent=styles['Normal'],
         fontSize=10,
-        textColor=colors.HexColor('#1e3a8a'),
-        backColor=colors.HexColor('#eff6ff'),
-        borderColor=colors.HexColor('#3b82f6'),
+        textColor=BLEU_NUIT,
+        backColor=BLEU_PALE,
+        borderColor=BLEU_VIF,
         borderWidth=1,
         borderPadding=8,
         spaceBefore=5,
@@ -105,7 +163,7 @@ def create_styles():
         name='ChiffreCle',
         parent=styles['Normal'],
         fontSize=18,
-        textColor=colors.HexColor('#059669'),
+        textColor=VERT,
         alignment=TA_CENTER,
         spaceBefore=5,
         spaceAfter=2
@@ -116,7 +174,7 @@ def create_styles():
         name='LabelChiffre',
         parent=styles['Normal'],
         fontSize=9,
-        textColor=colors.HexColor('#64748b'),
+        textColor=GRIS_MOYEN,
         alignment=TA_CENTER
     ))
     
@@ -125,125 +183,240 @@ def create_styles():
         name='PiedPage',
         parent=styles['Normal'],
         fontSize=8,
-        textColor=colors.HexColor('#94a3b8'),
+        textColor=GRIS_CLAIR,
         alignment=TA_CENTER
     ))
     
     return styles
 
 
+_STYLES = None
+_STYLES_LOCK = threading.Lock()
+
+
+def get_styles():
+    """Retourne la feuille de styles partagée (construite au premier appel)"""
+    global _STYLES
+    if _STYLES is None:
+        with _STYLES_LOCK:
+            if _STYLES is None:
+                _STYLES = create_styles()
+    return _STYLES
+
+
+class CanvasTable(Flowable):
+    """
+    Tableau dessiné directement sur le canvas (rect + drawString).
+    Les cellules sont des textes d'une ligne : la géométrie est connue d'avance,
+    ce qui évite la mesure cellule par cellule de platypus.Table.
+    """
+
+    def __init__(self, rows, col_widths, row_heights):
+        Flowable.__init__(self)
+        self.rows = rows
+        self.col_widths = col_widths
+        self.row_heights = row_heights
+        self.hAlign = 'CENTER'
+        # Abscisses des colonnes calculées une seule fois
+        self.col_x = [0]
+        for w in col_widths:
+            self.col_x.append(self.col_x[-1] + w)
+        self.width = self.col_x[-1]
+        self.height = sum(row_heights)
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw_centred(self, font, size, x, y, text):
+        """drawCentredString avec une police déjà résolue (pas de recherche par nom)"""
+        self.canv.drawString(x - font.stringWidth(text, size) / 2.0, y, text)
+
+    def draw_grid(self, box_color, grid_color):
+        """Trace le quadrillage intérieur puis le cadre"""
+        canv = self.canv
+        canv.setStrokeColor(grid_color)
+        canv.setLineWidth(0.5)
+        for x in self.col_x[1:-1]:
+            canv.line(x, 0, x, self.height)
+        y = self.height
+        for h in self.row_heights[:-1]:
+            y -= h
+            canv.line(0, y, self.width, y)
+        canv.setStrokeColor(box_color)
+        canv.setLineWidth(1)
+        canv.rect(0, 0, self.width, self.height, stroke=1, fill=0)
+
+
+class KpiTable(CanvasTable):
+    """Tableau de chiffres clés : valeur en gras au-dessus de son libellé"""
+
+    PADDING = 10
+    ESPACE = 2  # entre la valeur et son libellé
+
+    def __init__(self, rows, col_widths, styles):
+        self.style_valeur = styles['ChiffreCle']
+        self.style_label = styles['LabelChiffre']
+        # Interlignes des deux styles + espace + marges haute et basse
+        self.row_height = self.style_valeur.leading + self.ESPACE + self.style_label.leading + 2 * self.PADDING
+        CanvasTable.__init__(self, rows, col_widths, [self.row_height] * len(rows))
+        self.police_label = pdfmetrics.getFont(self.style_label.fontName)
+
+    def draw(self):
+        canv = self.canv
+        canv.setFillColor(FOND_CLAIR)
+        canv.rect(0, 0, self.width, self.height, stroke=0, fill=1)
+
+        # Positions calculées une fois, puis une passe par police :
+        # toutes les valeurs, puis tous les libellés (2 changements d'état au lieu de 2 par cellule)
+        sv, sl = self.style_valeur, self.style_label
+        cells = []
+        y_row = self.height
+        for row in self.rows:
+            y_row -= self.row_height
+            # Libellé en bas de cellule, valeur posée juste au-dessus
+            y_label = y_row + self.PADDING + sl.leading - sl.fontSize
+            y_valeur = y_label + sl.fontSize + self.ESPACE
+            for i, cell in enumerate(row):
+                if cell is not None:
+                    x = (self.col_x[i] + self.col_x[i + 1]) / 2.0
+                    cells.append((x, y_valeur, y_label, cell))
+
+        canv.setFillColor(sv.textColor)
+        canv.setFont(POLICE_GRAS.fontName, sv.fontSize)
+        for x, y_valeur, _, (val, _) in cells:
+            self.draw_centred(POLICE_GRAS, sv.fontSize, x, y_valeur, str(val))
+        canv.setFillColor(sl.textColor)
+        canv.setFont(self.police_label.fontName, sl.fontSize)
+        for x, _, y_label, (_, label) in cells:
+            self.draw_centred(self.police_label, sl.fontSize, x, y_label, str(label))
+
+        self.draw_grid(GRIS_BORDURE, GRIS_BORDURE)
+
+
+class DataTable(CanvasTable):
+    """Tableau de données : en-tête bleu, lignes alternées, 1re colonne à gauche"""
+
+    ROW_HEIGHT = 24  # interligne 12 + 2 x 6 de marge
+    H_PADDING = 8
+
+    def __init__(self, rows, col_widths, with_header=True):
+        CanvasTable.__init__(self, rows, col_widths, [self.ROW_HEIGHT] * len(rows))
+        self.with_header = with_header
+        self.centres = [(self.col_x[i] + self.col_x[i + 1]) / 2.0 for i in range(len(col_widths))]
+
+    def split(self, availWidth, availHeight):
+        n = int(availHeight // self.ROW_HEIGHT)
+        if n < 1 or n >= len(self.rows):
+            return []
+        return [
+            DataTable(self.rows[:n], self.col_widths, self.with_header),
+            DataTable(self.rows[n:], self.col_widths, with_header=False),
+        ]
+
+    def draw(self):
+        canv = self.canv
+        centres = self.centres
+
+        y = self.height
+        for idx, row in enumerate(self.rows):
+            y -= self.ROW_HEIGHT
+            if idx == 0 and self.with_header:
+                canv.setFillColor(BLEU_CFTC)
+                canv.rect(0, y, self.width, self.ROW_HEIGHT, stroke=0, fill=1)
+                canv.setFillColor(colors.white)
+                canv.setFont(POLICE_GRAS.fontName, 10)
+                for x, cell in zip(centres, row):
+                    self.draw_centred(POLICE_GRAS, 10, x, y + 8, str(cell))
+                continue
+
+            body_idx = idx - 1 if self.with_header else idx
+            canv.setFillColor(FOND_CLAIR if body_idx % 2 else colors.white)
+            canv.rect(0, y, self.width, self.ROW_HEIGHT, stroke=0, fill=1)
+            canv.setFillColor(colors.black)
+            canv.setFont(POLICE.fontName, 9)
+            canv.drawString(self.H_PADDING, y + 9, str(row[0]))
+            for x, cell in zip(centres[1:], row[1:]):
+                self.draw_centred(POLICE, 9, x, y + 9, str(cell))
+
+        self.draw_grid(GRIS_LIGNE, GRIS_BORDURE)
+
+
+# Largeurs de colonnes des tableaux de KPIs (1 à 4 colonnes), partagées entre tableaux
+KPI_COL_WIDTHS = {n: [4.5*cm] * n for n in range(1, 5)}
+
+
+def format_milliers(n):
+    """Entier avec espace comme séparateur de milliers (668510 → '668 510')"""
+    return f"{n:,}".replace(',', ' ')
+
+
 def create_kpi_table(data_list, styles):
     """Crée un tableau de KPIs (chiffres clés)"""
     # data_list = [(valeur, label), ...]
-    cells = []
-    for val, label in data_list:
-        cell_content = [
-            Paragraph(f"<b>{val}</b>", styles['ChiffreCle']),
-            Paragraph(label, styles['LabelChiffre'])
-        ]
-        cells.append(cell_content)
+    cells = list(data_list)
     
-    # Créer le tableau
     n_cols = min(4, len(cells))
     rows = []
     for i in range(0, len(cells), n_cols):
         row = cells[i:i+n_cols]
         # Compléter si nécessaire
         while len(row) < n_cols:
-            row.append(['', ''])
+            row.append(None)
         rows.append(row)
     
-    table = Table(rows, colWidths=[4.5*cm] * n_cols)
-    table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8fafc')),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
-    
-    return table
+    return KpiTable(rows, KPI_COL_WIDTHS[n_cols], styles)
 
 
 def create_data_table(headers, rows, col_widths=None):
     """Crée un tableau de données"""
-    data = [headers] + rows
-    
     if col_widths is None:
         col_widths = [4*cm] * len(headers)
     
-    table = Table(data, colWidths=col_widths)
-    table.setStyle(TableStyle([
-        # En-tête
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        # Corps
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        # Bordures
-        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-        # Padding
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        # Alternance couleurs
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-    ]))
-    
-    return table
+    return DataTable([headers] + rows, col_widths)
+
+
+@functools.lru_cache(maxsize=512)
+def parse_paragraph(text, style):
+    """Analyse le balisage d'un paragraphe (résultat partagé entre rapports)"""
+    return Paragraph(text, style)
+
+
+def paragraph(text, style):
+    """
+    Paragraph construit à partir de l'analyse en cache : titres, puces et pieds
+    de page identiques d'un rapport à l'autre ne sont analysés qu'une fois.
+    Chaque appel renvoie un nouveau flowable (wrap/split modifient son état).
+    """
+    modele = parse_paragraph(text, style)
+    return Paragraph(modele.text, modele.style, bulletText=modele.bulletText, frags=modele.frags)
 
 
 def add_argument_box(story, title, arguments, styles):
     """Ajoute un encadré d'arguments NAO"""
-    content = f"<b>💡 {title}</b><br/><br/>"
-    for arg in arguments:
-        content += f"• {arg}<br/>"
+    content = f"<b>💡 {title}</b><br/><br/>" + "".join(f"• {arg}<br/>" for arg in arguments)
     
-    story.append(Paragraph(content, styles['ArgumentNAO']))
+    story.append(paragraph(content, styles['ArgumentNAO']))
     story.append(Spacer(1, 10))
 
 
-def generate_rapport_nao(data, output_path):
-    """Génère le rapport PDF complet"""
-    
-    styles = create_styles()
-    
-    # Créer le document
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        rightMargin=2*cm,
-        leftMargin=2*cm,
-        topMargin=2*cm,
-        bottomMargin=2*cm
-    )
-    
-    story = []
-    
-    # ===== PAGE DE TITRE =====
-    story.append(Spacer(1, 3*cm))
-    story.append(Paragraph("RAPPORT NAO", styles['TitreRapport']))
-    story.append(Paragraph("Négociation Annuelle Obligatoire", styles['SousTitre']))
-    story.append(Spacer(1, 1*cm))
-    
-    # Date et source
-    date_maj = data.get('meta', {}).get('derniere_mise_a_jour', datetime.now().strftime('%Y-%m-%d'))
-    story.append(Paragraph(f"<b>Données au {date_maj}</b>", styles['SousTitre']))
-    story.append(Spacer(1, 2*cm))
-    
-    # KPIs principaux
-    inflation = data.get('inflation', {}).get('taux_annuel', 1.3)
-    smic = data.get('smic', {}).get('montant_net', 1443)
-    
+def add_bullets(story, puce, items, styles):
+    """Ajoute une liste à puces, un paragraphe par élément"""
+    style = styles['Puce']
+    story.extend(paragraph(f"{puce} {item}", style) for item in items)
+
+
+def calcul_inflation_cumulee(taux):
+    """Inflation cumulée (%) à partir d'une liste de taux annuels (%)"""
+    return round((math.prod(1 + t / 100 for t in taux) - 1) * 100, 1)
+
+
+def format_date_generation():
+    """Horodatage affiché en pied de rapport"""
+    return datetime.now().strftime('%d/%m/%Y à %H:%M')
+
+
+def extract_indicateurs(data, now_str=None):
+    """Extrait les indicateurs repris dans plusieurs sections du rapport"""
     # Chômage - prendre le dernier trimestre de la liste
     chomage_list = data.get('chomage', [])
     if isinstance(chomage_list, list) and chomage_list:
@@ -252,50 +425,76 @@ def generate_rapport_nao(data, output_path):
     else:
         chomage = 7.3
         chomage_jeunes = 17.3
+
+    # Inflation cumulée : valeur précalculée, sinon recalculée depuis les taux annuels
+    hist = data.get('historique_5ans', {})
+    cumul = hist.get('calculs_derives', {}).get('inflation_cumulee')
+    if cumul is None and hist.get('inflation', {}).get('valeurs'):
+        cumul = calcul_inflation_cumulee(hist['inflation']['valeurs'])
+
+    return {
+        'inflation': data.get('inflation', {}).get('taux_annuel', 1.3),
+        'smic': data.get('smic', {}).get('montant_net', 1443),
+        'chomage': chomage,
+        'chomage_jeunes': chomage_jeunes,
+        'hist': hist,
+        'inflation_cumulee': cumul,
+        'genere_le': now_str or format_date_generation(),
+    }
+
+
+def add_section_title(story, title, styles):
+    """Ajoute un titre de section souligné"""
+    story.append(paragraph(title, styles['TitreSection']))
+    story.append(HRFlowable(width="100%", thickness=1, color=BLEU_CFTC))
+    story.append(Spacer(1, 10))
+
+
+# ===== PAGE DE TITRE =====
+def build_page_titre(data, styles, ind):
+    story = []
+    story.append(Spacer(1, 3*cm))
+    story.append(paragraph("RAPPORT NAO", styles['TitreRapport']))
+    story.append(paragraph("Négociation Annuelle Obligatoire", styles['SousTitre']))
+    story.append(Spacer(1, 1*cm))
+    
+    # Date et source
+    meta = data.get('meta', {})
+    date_maj = meta['derniere_mise_a_jour'] if 'derniere_mise_a_jour' in meta else date.today().isoformat()
+    story.append(paragraph(f"<b>Données au {date_maj}</b>", styles['SousTitre']))
+    story.append(Spacer(1, 2*cm))
     
+    # KPIs principaux
     kpis = [
-        (f"{inflation}%", "Inflation"),
-        (f"{smic}€", "SMIC net"),
-        (f"{chomage}%", "Chômage"),
+        (f"{ind['inflation']}%", "Inflation"),
+        (f"{ind['smic']}€", "SMIC net"),
+        (f"{ind['chomage']}%", "Chômage"),
         (f"+2.5%", "Salaires prévus 2026")
     ]
     story.append(create_kpi_table(kpis, styles))
     
     story.append(Spacer(1, 2*cm))
-    story.append(Paragraph("Document généré par le Dashboard NAO CFTC", styles['PiedPage']))
-    story.append(PageBreak())
-    
-    # ===== SECTION 1: CONTEXTE ÉCONOMIQUE =====
-    story.append(Paragraph("1. Contexte économique", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    story.append(paragraph("Document généré par le Dashboard NAO CFTC", styles['PiedPage']))
+    return story
+
+
+# ===== SECTION 1: CONTEXTE ÉCONOMIQUE =====
+def build_section_contexte(data, styles, ind):
+    story = []
+    add_section_title(story, "1. Contexte économique", styles)
     
     # Prévisions
     prev = data.get('previsions', {})
     bdf = prev.get('banque_de_france', {})
     
-    story.append(Paragraph("1.1 Prévisions macroéconomiques (Banque de France)", styles['TitreSousSection']))
+    story.append(paragraph("1.1 Prévisions macroéconomiques (Banque de France)", styles['TitreSousSection']))
     
     if bdf:
-        headers = ['Indicateur', '2024', '2025', '2026', '2027']
-        rows = [
-            ['PIB (%)', str(bdf.get('pib_croissance', {}).get('2024', '-')),
-             str(bdf.get('pib_croissance', {}).get('2025', '-')),
-             str(bdf.get('pib_croissance', {}).get('2026', '-')),
-             str(bdf.get('pib_croissance', {}).get('2027', '-'))],
-            ['Inflation IPCH (%)', str(bdf.get('inflation_ipch', {}).get('2024', '-')),
-             str(bdf.get('inflation_ipch', {}).get('2025', '-')),
-             str(bdf.get('inflation_ipch', {}).get('2026', '-')),
-             str(bdf.get('inflation_ipch', {}).get('2027', '-'))],
-            ['Chômage (%)', str(bdf.get('taux_chomage', {}).get('2024', '-')),
-             str(bdf.get('taux_chomage', {}).get('2025', '-')),
-             str(bdf.get('taux_chomage', {}).get('2026', '-')),
-             str(bdf.get('taux_chomage', {}).get('2027', '-'))],
-            ['Salaires nominaux (%)', str(bdf.get('salaires_nominaux', {}).get('2024', '-')),
-             str(bdf.get('salaires_nominaux', {}).get('2025', '-')),
-             str(bdf.get('salaires_nominaux', {}).get('2026', '-')),
-             str(bdf.get('salaires_nominaux', {}).get('2027', '-'))],
-        ]
+        headers = ['Indicateur'] + list(ANNEES_BDF)
+        rows = []
+        for cle, libelle in INDICATEURS_BDF:
+            serie = bdf.get(cle) or {}
+            rows.append([libelle] + [str(serie.get(annee, NON_DISPONIBLE)) for annee in ANNEES_BDF])
         story.append(create_data_table(headers, rows, [5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm]))
         story.append(Spacer(1, 15))
     
@@ -304,9 +503,9 @@ def generate_rapport_nao(data, output_path):
         add_argument_box(story, "Arguments NAO - Prévisions", prev['arguments_nao'][:5], styles)
     
     # ===== SECTION 2: INFLATION =====
-    story.append(Paragraph("1.2 Évolution de l'inflation", styles['TitreSousSection']))
+    story.append(paragraph("1.2 Évolution de l'inflation", styles['TitreSousSection']))
     
-    hist = data.get('historique_5ans', {})
+    hist = ind['hist']
     if hist.get('inflation'):
         infl = hist['inflation']
         annees = hist.get('annees', [2020, 2021, 2022, 2023, 2024, 2025])
@@ -316,22 +515,23 @@ def generate_rapport_nao(data, output_path):
         story.append(Spacer(1, 10))
         
         # Inflation cumulée
-        if hist.get('calculs_derives', {}).get('inflation_cumulee'):
-            story.append(Paragraph(
-                f"<b>Inflation cumulée 2020-2025 : {hist['calculs_derives']['inflation_cumulee']}%</b>",
+        if ind['inflation_cumulee'] is not None:
+            story.append(paragraph(
+                f"<b>Inflation cumulée 2020-2025 : {ind['inflation_cumulee']}%</b>",
                 styles['TexteNormal']
             ))
-    
-    story.append(PageBreak())
-    
-    # ===== SECTION 2: SALAIRES =====
-    story.append(Paragraph("2. Salaires et pouvoir d'achat", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    return story
+
+
+# ===== SECTION 2: SALAIRES =====
+def build_section_salaires(data, styles, ind):
+    story = []
+    add_section_title(story, "2. Salaires et pouvoir d'achat", styles)
+    inflation_cumulee = 14 if ind['inflation_cumulee'] is None else ind['inflation_cumulee']
     
     # SMIC
     smic_data = data.get('smic', {})
-    story.append(Paragraph("2.1 SMIC", styles['TitreSousSection']))
+    story.append(paragraph("2.1 SMIC", styles['TitreSousSection']))
     
     kpis_smic = [
         (f"{smic_data.get('montant_brut', 1823)}€", "SMIC brut"),
@@ -343,38 +543,38 @@ def generate_rapport_nao(data, output_path):
     story.append(Spacer(1, 15))
     
     # Salaires médians
-    story.append(Paragraph("2.2 Salaires médians par CSP", styles['TitreSousSection']))
+    story.append(paragraph("2.2 Salaires médians par CSP", styles['TitreSousSection']))
     
     sal = data.get('salaires_medians', {})
     if sal.get('par_csp'):
         headers = ['CSP', 'Médiane (€)', 'Évolution']
-        rows = [[c['csp'], f"{c['median']}€", f"+{c.get('evolution', '-')}%"] for c in sal['par_csp'][:5]]
+        rows = [[c['csp'], f"{c['median']}€", f"+{c.get('evolution', NON_DISPONIBLE)}%"] for c in sal['par_csp'][:5]]
         story.append(create_data_table(headers, rows, [6*cm, 4*cm, 4*cm]))
     
     # Arguments NAO salaires
     arguments_salaires = [
-        f"Inflation cumulée depuis 2020 : {hist.get('calculs_derives', {}).get('inflation_cumulee', 14)}% - rattrapage nécessaire",
+        f"Inflation cumulée depuis 2020 : {inflation_cumulee}% - rattrapage nécessaire",
         f"SMIC revalorisé de {smic_data.get('evolution_depuis_2020', 17)}% depuis 2020",
         f"Prévision salaires 2026 : +2.5% (Banque de France)",
         "Écart salaire médian H/F : 14.9% - réduction à négocier",
         "Pouvoir d'achat en baisse pour les bas salaires depuis 2022"
     ]
     add_argument_box(story, "Arguments NAO - Salaires", arguments_salaires, styles)
-    
-    story.append(PageBreak())
-    
-    # ===== SECTION 3: EMPLOI =====
-    story.append(Paragraph("3. Emploi et marché du travail", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    return story
+
+
+# ===== SECTION 3: EMPLOI =====
+def build_section_emploi(data, styles, ind):
+    story = []
+    add_section_title(story, "3. Emploi et marché du travail", styles)
     
     # Chômage
-    story.append(Paragraph("3.1 Taux de chômage", styles['TitreSousSection']))
+    story.append(paragraph("3.1 Taux de chômage", styles['TitreSousSection']))
     
     # Utiliser les données déjà extraites
     kpis_chomage = [
-        (f"{chomage}%", "Taux national"),
-        (f"{chomage_jeunes}%", "Jeunes 15-24 ans"),
+        (f"{ind['chomage']}%", "Taux national"),
+        (f"{ind['chomage_jeunes']}%", "Jeunes 15-24 ans"),
         (f"5.4%", "Seniors 50+"),
     ]
     story.append(create_kpi_table(kpis_chomage, styles))
@@ -383,23 +583,23 @@ def generate_rapport_nao(data, output_path):
     # Données régionales
     reg = data.get('donnees_regionales', {})
     if reg.get('regions'):
-        story.append(Paragraph("3.2 Disparités régionales", styles['TitreSousSection']))
+        story.append(paragraph("3.2 Disparités régionales", styles['TitreSousSection']))
         headers = ['Région', 'Chômage', 'Salaire médian', 'Tensions']
         rows = [[r['nom'], f"{r['chomage']}%", f"{r['salaire_median']}€", f"{r['tensions']}%"] 
-                for r in sorted(reg['regions'], key=lambda x: x['chomage'])[:8]]
+                for r in heapq.nsmallest(8, reg['regions'], key=itemgetter('chomage'))]
         story.append(create_data_table(headers, rows, [5*cm, 2.5*cm, 3.5*cm, 2.5*cm]))
-    
-    story.append(PageBreak())
-    
-    # ===== SECTION 4: CONDITIONS DE TRAVAIL =====
-    story.append(Paragraph("4. Conditions de travail", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    return story
+
+
+# ===== SECTION 4: CONDITIONS DE TRAVAIL =====
+def build_section_conditions_travail(data, styles, ind):
+    story = []
+    add_section_title(story, "4. Conditions de travail", styles)
     
     # Temps de travail
     tt = data.get('temps_travail', {})
     if tt:
-        story.append(Paragraph("4.1 Temps de travail", styles['TitreSousSection']))
+        story.append(paragraph("4.1 Temps de travail", styles['TitreSousSection']))
         kpis_tt = [
             (f"{tt.get('duree_travail', {}).get('duree_hebdo_habituelle', 37.1)}h", "Durée hebdo moyenne"),
             (f"{tt.get('temps_partiel', {}).get('taux_global_pct', 17.4)}%", "Temps partiel"),
@@ -411,9 +611,9 @@ def generate_rapport_nao(data, output_path):
     # Accidents du travail
     at = data.get('accidents_travail', {})
     if at:
-        story.append(Paragraph("4.2 Santé et sécurité", styles['TitreSousSection']))
+        story.append(paragraph("4.2 Santé et sécurité", styles['TitreSousSection']))
         kpis_at = [
-            (f"{at.get('accidents_avec_arret', {}).get('total', 668510):,}".replace(',', ' '), "Accidents/an"),
+            (format_milliers(at.get('accidents_avec_arret', {}).get('total', 668510)), "Accidents/an"),
             (f"{at.get('accidents_avec_arret', {}).get('indice_frequence', 31.4)}", "Indice fréquence"),
             (f"{at.get('accidents_mortels', {}).get('total', 738)}", "Accidents mortels"),
         ]
@@ -422,18 +622,18 @@ def generate_rapport_nao(data, output_path):
     # Arguments NAO conditions
     if at.get('arguments_nao'):
         add_argument_box(story, "Arguments NAO - Santé et sécurité", at['arguments_nao'][:4], styles)
-    
-    story.append(PageBreak())
-    
-    # ===== SECTION 5: ÉGALITÉ ET PARTAGE DE LA VALEUR =====
-    story.append(Paragraph("5. Égalité et partage de la valeur", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    return story
+
+
+# ===== SECTION 5: ÉGALITÉ ET PARTAGE DE LA VALEUR =====
+def build_section_egalite(data, styles, ind):
+    story = []
+    add_section_title(story, "5. Égalité et partage de la valeur", styles)
     
     # Égalité pro
     egapro = data.get('egalite_professionnelle', {})
     if egapro:
-        story.append(Paragraph("5.1 Index égalité professionnelle (Egapro)", styles['TitreSousSection']))
+        story.append(paragraph("5.1 Index égalité professionnelle (Egapro)", styles['TitreSousSection']))
         kpis_eg = [
             (f"{egapro.get('index_moyen', {}).get('valeur', 88)}/100", "Index moyen"),
             (f"{egapro.get('conformite', {}).get('pct_entreprises_conformes', 77)}%", "Entreprises conformes"),
@@ -445,7 +645,7 @@ def generate_rapport_nao(data, output_path):
     # Épargne salariale
     es = data.get('epargne_salariale', {})
     if es:
-        story.append(Paragraph("5.2 Épargne salariale et partage de la valeur", styles['TitreSousSection']))
+        story.append(paragraph("5.2 Épargne salariale et partage de la valeur", styles['TitreSousSection']))
         kpis_es = [
             (f"{es.get('couverture', {}).get('pct_salaries', 53.5)}%", "Salariés couverts"),
             (f"{es.get('montants', {}).get('total_distribue_mds', 21.7)} Mds€", "Total distribué"),
@@ -455,50 +655,65 @@ def generate_rapport_nao(data, output_path):
         
         if es.get('arguments_nao'):
             add_argument_box(story, "Arguments NAO - Partage de la valeur", es['arguments_nao'][:4], styles)
-    
-    story.append(PageBreak())
-    
-    # ===== SECTION 6: CONVENTIONS COLLECTIVES =====
-    story.append(Paragraph("6. Conventions collectives", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    return story
+
+
+# Conformité des grilles : indexé par (minimum de grille < SMIC net)
+SEUIL_SMIC = 1443
+STATUTS_SMIC = ("✓ OK", "⚠️ < SMIC")
+
+
+def format_branch_rows(branches):
+    """Lignes du tableau des branches (nom, effectifs, minimum, statut SMIC)"""
+    rows = []
+    append = rows.append
+    for b in branches:
+        effectifs = b.get('effectifs', NON_DISPONIBLE)
+        min_grille = b.get('min_grille', NON_DISPONIBLE)
+        statut = STATUTS_SMIC[b.get('min_grille', 0) < SEUIL_SMIC]
+        append([
+            b['nom'][:30],
+            format_milliers(effectifs) if isinstance(effectifs, int) else str(effectifs),
+            f"{min_grille}€",
+            statut
+        ])
+    return rows
+
+
+# ===== SECTION 6: CONVENTIONS COLLECTIVES =====
+def build_section_conventions(data, styles, ind):
+    story = []
+    add_section_title(story, "6. Conventions collectives", styles)
     
     cc = data.get('conventions_collectives', {})
     if cc.get('branches'):
-        story.append(Paragraph("6.1 Principales branches et conformité SMIC", styles['TitreSousSection']))
+        story.append(paragraph("6.1 Principales branches et conformité SMIC", styles['TitreSousSection']))
         
         headers = ['Branche', 'Effectifs', 'Min grille', 'Statut']
-        rows = []
-        for b in cc['branches'][:12]:
-            statut = "⚠️ < SMIC" if b.get('min_grille', 0) < 1443 else "✓ OK"
-            rows.append([
-                b['nom'][:30],
-                f"{b.get('effectifs', '-'):,}".replace(',', ' ') if isinstance(b.get('effectifs'), int) else str(b.get('effectifs', '-')),
-                f"{b.get('min_grille', '-')}€",
-                statut
-            ])
+        rows = format_branch_rows(cc['branches'][:12])
         story.append(create_data_table(headers, rows, [6*cm, 3*cm, 2.5*cm, 2.5*cm]))
         story.append(Spacer(1, 10))
         
         # Alerte branches non conformes
         if cc.get('meta', {}).get('note'):
-            story.append(Paragraph(
+            story.append(paragraph(
                 f"<b>⚠️ Alerte :</b> {cc['meta']['note']}",
                 styles['TexteNormal']
             ))
-    
-    story.append(PageBreak())
-    
-    # ===== SECTION 7: SYNTHÈSE ET RECOMMANDATIONS =====
-    story.append(Paragraph("7. Synthèse et recommandations NAO", styles['TitreSection']))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#1e40af')))
-    story.append(Spacer(1, 10))
+    return story
+
+
+# ===== SECTION 7: SYNTHÈSE ET RECOMMANDATIONS =====
+def build_section_synthese(data, styles, ind):
+    story = []
+    add_section_title(story, "7. Synthèse et recommandations NAO", styles)
+    inflation_cumulee = 14 if ind['inflation_cumulee'] is None else ind['inflation_cumulee']
     
     # Synthèse
-    story.append(Paragraph("7.1 Points clés pour la négociation", styles['TitreSousSection']))
+    story.append(paragraph("7.1 Points clés pour la négociation", styles['TitreSousSection']))
     
     points_cles = [
-        f"<b>Inflation</b> : {inflation}% en 2025, cumulée {hist.get('calculs_derives', {}).get('inflation_cumulee', 14)}% depuis 2020",
+        f"<b>Inflation</b> : {ind['inflation']}% en 2025, cumulée {inflation_cumulee}% depuis 2020",
         f"<b>Salaires prévus</b> : +2.5% en 2026 selon Banque de France",
         f"<b>Pouvoir d'achat</b> : rattrapage nécessaire pour les bas salaires",
         f"<b>Égalité H/F</b> : écart de rémunération de 4.2% à poste égal, 14.9% global",
@@ -506,14 +721,12 @@ def generate_rapport_nao(data, output_path):
         f"<b>Santé-sécurité</b> : 668 510 AT/an, vigilance sur certains secteurs",
     ]
     
-    for point in points_cles:
-        story.append(Paragraph(f"• {point}", styles['TexteNormal']))
-        story.append(Spacer(1, 5))
+    add_bullets(story, "•", points_cles, styles)
     
     story.append(Spacer(1, 20))
     
     # Recommandations
-    story.append(Paragraph("7.2 Revendications suggérées", styles['TitreSousSection']))
+    story.append(paragraph("7.2 Revendications suggérées", styles['TitreSousSection']))
     
     revendications = [
         "<b>Augmentation générale</b> : au minimum inflation anticipée (1.4%) + rattrapage inflation passée",
@@ -525,34 +738,232 @@ def generate_rapport_nao(data, output_path):
         "<b>Formation</b> : accès équitable à la formation pour toutes les catégories",
     ]
     
-    for rev in revendications:
-        story.append(Paragraph(f"➤ {rev}", styles['TexteNormal']))
-        story.append(Spacer(1, 5))
+    add_bullets(story, "➤", revendications, styles)
     
     # Pied de page final
     story.append(Spacer(1, 2*cm))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor('#cbd5e1')))
+    story.append(HRFlowable(width="100%", thickness=0.5, color=GRIS_LIGNE))
     story.append(Spacer(1, 10))
-    story.append(Paragraph(
-        f"Document généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')} • Dashboard NAO CFTC • Contact : hspringragain@cftc.fr",
+    story.append(paragraph(
+        f"Document généré le {ind['genere_le']} • Dashboard NAO CFTC • Contact : hspringragain@cftc.fr",
         styles['PiedPage']
     ))
+    return story
+
+
+# Sections du rapport, chacune commençant sur une nouvelle page
+SECTIONS = [
+    build_page_titre,
+    build_section_contexte,
+    build_section_salaires,
+    build_section_emploi,
+    build_section_conditions_travail,
+    build_section_egalite,
+    build_section_conventions,
+    build_section_synthese,
+]
+
+
+def iter_story(data, now_str=None):
+    """Enchaîne les flowables de toutes les sections, séparées par des sauts de page"""
+    styles = get_styles()
+    ind = extract_indicateurs(data, now_str)
+    for i, build_section in enumerate(SECTIONS):
+        if i:
+            yield PageBreak()
+        yield from build_section(data, styles, ind)
+
+
+def new_document(output):
+    """Crée le document A4 du rapport (chemin ou fichier binaire)"""
+    return SimpleDocTemplate(
+        output,
+        pagesize=A4,
+        rightMargin=2*cm,
+        leftMargin=2*cm,
+        topMargin=2*cm,
+        bottomMargin=2*cm
+    )
+
+
+def render_section(args):
+    """Rend une section seule en PDF (exécutée dans un processus du pool)"""
+    data, index, now_str = args
+    buf = io.BytesIO()
+    new_document(buf).build(SECTIONS[index](data, get_styles(), extract_indicateurs(data, now_str)))
+    return buf.getvalue()
+
+
+def load_pdf_writer():
+    """
+    Importe pypdf à la demande (rendu parallèle uniquement).
+    Retourne None si le module est absent → rendu séquentiel.
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        return None
+    return PdfWriter
+
+
+def write_pdf(output, payload):
+    """
+    Écrit le PDF construit en mémoire : dans l'objet fichier fourni (réponse
+    HTTP, BytesIO...) ou directement dans le fichier, sans tampon Python.
+    """
+    if hasattr(output, 'write'):
+        output.write(payload)
+        return
+    view = memoryview(payload)
+    fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def generate_rapport_nao(data, output_path, workers=1, now_str=None, executor=None):
+    """
+    Génère le rapport PDF complet.
+    output_path : chemin du fichier ou objet fichier binaire.
+    now_str : horodatage du pied de page, calculé une fois pour tout un lot
+    (par défaut : maintenant).
+    
+    Avec workers > 1 (et pypdf installé), chaque section est rendue dans un
+    processus séparé puis les PDF sont concaténés. Pour un rapport isolé le
+    coût de démarrage des processus dépasse le gain : le mode séquentiel
+    reste le défaut.
+    executor : pool de processus déjà ouvert (partagé par un lot), utilisé à la
+    place d'un pool de workers processus propre à ce rapport.
+    """
+    now_str = now_str or format_date_generation()
+    PdfWriter = load_pdf_writer() if workers > 1 or executor is not None else None
+    if PdfWriter is not None:
+        section_args = [(data, i, now_str) for i in range(len(SECTIONS))]
+        if executor is not None:
+            parts = list(executor.map(render_section, section_args))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(render_section, section_args))
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(io.BytesIO(part))
+        buf = io.BytesIO()
+        writer.write(buf)
+    else:
+        # build() dépile la liste (len, [0], del) : le flux est matérialisé une fois
+        buf = io.BytesIO()
+        new_document(buf).build(list(iter_story(data, now_str)))
+    write_pdf(output_path, buf.getbuffer())
     
-    # Construire le PDF
-    doc.build(story)
-    print(f"✅ Rapport PDF généré : {output_path}")
+    if isinstance(output_path, (str, os.PathLike)):
+        print(f"✅ Rapport PDF généré : {output_path}")
+    else:
+        print("✅ Rapport PDF généré")
     return output_path
 
 
+async def generate_rapport_nao_async(data, output_path, now_str=None, workers=1):
+    """Génère un rapport dans un thread, sans bloquer la boucle d'événements"""
+    import asyncio
+    return await asyncio.to_thread(generate_rapport_nao, data, output_path, workers=workers, now_str=now_str)
+
+
+def load_and_generate_rapport_nao(data_path, output_path, now_str, executor=None):
+    """Charge les données puis génère le rapport (un job de lot, dans son thread)"""
+    return generate_rapport_nao(load_data(data_path), output_path, now_str=now_str, executor=executor)
+
+
+async def generate_rapports_nao(jobs, workers=1):
+    """
+    Génère plusieurs rapports en parallèle ; jobs = [(data_path, output_path), ...]
+    Chaque rapport est chargé et construit dans un thread. Avec workers > 1 (et
+    pypdf installé), les sections de tous les rapports passent par un seul pool
+    de workers processus : le lot n'en lance jamais plus de workers.
+    """
+    import asyncio
+    from contextlib import nullcontext
+    now_str = format_date_generation()
+    if workers > 1 and load_pdf_writer() is not None:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = nullcontext()
+    with pool as executor:
+        return await asyncio.gather(*[
+            asyncio.to_thread(load_and_generate_rapport_nao, data_path, output_path, now_str, executor)
+            for data_path, output_path in jobs
+        ])
+
+
+USAGE = (
+    "Usage :\n"
+    "  python generate_pdf_nao.py [data.json] [output.pdf] [--workers=N]\n"
+    "  python generate_pdf_nao.py a.json b.json [...] dossier_sortie/ [--workers=N]"
+)
+
+
+def batch_jobs(data_paths, output_dir):
+    """
+    Associe à chaque fichier de données son rapport rapport_nao_<nom>.pdf dans
+    output_dir. Deux entrées de même nom (a/data.json, b/data.json) reçoivent un
+    suffixe _2, _3... : aucun rapport n'en écrase un autre.
+    """
+    jobs = []
+    used = set()
+    for path in data_paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = f"rapport_nao_{stem}.pdf"
+        n = 2
+        while name in used:
+            name = f"rapport_nao_{stem}_{n}.pdf"
+            n += 1
+        used.add(name)
+        jobs.append((path, os.path.join(output_dir, name)))
+    return jobs
+
+
+def usage_error(message):
+    """Affiche l'erreur et l'usage, puis quitte (code 2)"""
+    print(f"❌ {message}", file=sys.stderr)
+    print(USAGE, file=sys.stderr)
+    sys.exit(2)
+
+
 def main():
-    # Arguments
-    if len(sys.argv) > 1:
-        data_path = sys.argv[1]
+    # Arguments (--workers=N : rendu des sections en parallèle)
+    args = [a for a in sys.argv[1:] if not a.startswith('--workers=')]
+    workers = next((a.split('=', 1)[1] for a in sys.argv[1:] if a.startswith('--workers=')), '1')
+    if not workers.isdigit() or int(workers) < 1:
+        usage_error(f"--workers attend un entier positif (reçu : {workers})")
+    workers = int(workers)
+    options = [a for a in args if a.startswith('--')]
+    if options:
+        usage_error(f"option inconnue : {options[0]}")
+    
+    # Plusieurs fichiers de données : le dernier argument est le dossier de sortie
+    if len(args) > 2:
+        output_dir = args[-1]
+        # Ancienne forme « data.json rapport.pdf ... » : on refuse plutôt que de deviner
+        if output_dir.lower().endswith(('.pdf', '.json')) or os.path.isfile(output_dir) \
+                or any(path.lower().endswith('.pdf') for path in args[:-1]):
+            usage_error("en mode lot, le dernier argument doit être un dossier de sortie")
+        os.makedirs(output_dir, exist_ok=True)
+        jobs = batch_jobs(args[:-1], output_dir)
+        print(f"📄 Génération de {len(jobs)} rapports NAO PDF dans {output_dir}...")
+        import asyncio
+        asyncio.run(generate_rapports_nao(jobs, workers))
+        return
+    
+    if len(args) > 0:
+        data_path = args[0]
     else:
         data_path = '/mnt/user-data/public/data.json'
     
-    if len(sys.argv) > 2:
-        output_path = sys.argv[2]
+    if len(args) > 1:
+        output_path = args[1]
     else:
         output_path = '/mnt/user-data/outputs/rapport_nao.pdf'
     
@@ -565,7 +976,7 @@ def main():
     data = load_data(data_path)
     
     # Générer le PDF
-    generate_rapport_nao(data, output_path)
+    generate_rapport_nao(data, output_path, workers=workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du mode lot de generate_pdf_nao.py
+
+Usage:
+    python -m unittest outputs/test_generate_pdf_nao.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generate_pdf_nao
+
+DATA_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'data.json')
+
+
+class BatchJobsTest(unittest.TestCase):
+
+    def test_noms_distincts_inchanges(self):
+        jobs = generate_pdf_nao.batch_jobs(['a/2024.json', 'b/2025.json'], 'out')
+        self.assertEqual(jobs, [
+            ('a/2024.json', os.path.join('out', 'rapport_nao_2024.pdf')),
+            ('b/2025.json', os.path.join('out', 'rapport_nao_2025.pdf')),
+        ])
+
+    def test_entrees_de_meme_nom(self):
+        jobs = generate_pdf_nao.batch_jobs(['a/data.json', 'b/data.json', 'c/data_2.json'], 'out')
+        sorties = [os.path.basename(output) for _, output in jobs]
+        self.assertEqual(sorties, ['rapport_nao_data.pdf', 'rapport_nao_data_2.pdf', 'rapport_nao_data_2_2.pdf'])
+
+
+@unittest.skipUnless(os.path.exists(DATA_JSON), "public/data.json absent")
+class BatchMainTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_deux_entrees_de_meme_nom_donnent_deux_rapports(self):
+        entrees = []
+        for dossier in ('a', 'b'):
+            os.makedirs(os.path.join(self.tmp, dossier))
+            entrees.append(shutil.copy(DATA_JSON, os.path.join(self.tmp, dossier, 'data.json')))
+        sortie = os.path.join(self.tmp, 'out')
+
+        with mock.patch.object(sys, 'argv', ['generate_pdf_nao.py'] + entrees + [sortie]), \
+                mock.patch('builtins.print'):
+            generate_pdf_nao.main()
+
+        self.assertEqual(sorted(os.listdir(sortie)), ['rapport_nao_data.pdf', 'rapport_nao_data_2.pdf'])
+        for nom in os.listdir(sortie):
+            with open(os.path.join(sortie, nom), 'rb') as f:
+                self.assertEqual(f.read(5), b'%PDF-')
+
+    @unittest.skipIf(generate_pdf_nao.load_pdf_writer() is None, "pypdf absent")
+    def test_un_seul_pool_de_processus_par_lot(self):
+        import asyncio
+        import concurrent.futures
+        entrees = [shutil.copy(DATA_JSON, os.path.join(self.tmp, f'{n}.json')) for n in ('a', 'b', 'c')]
+        jobs = generate_pdf_nao.batch_jobs(entrees, self.tmp)
+        pools = []
+        pool_class = concurrent.futures.ProcessPoolExecutor
+
+        def compter_pool(*args, **kwargs):
+            pools.append(kwargs.get('max_workers'))
+            return pool_class(*args, **kwargs)
+
+        with mock.patch.object(concurrent.futures, 'ProcessPoolExecutor', compter_pool), \
+                mock.patch('builtins.print'):
+            asyncio.run(generate_pdf_nao.generate_rapports_nao(jobs, workers=2))
+
+        self.assertEqual(pools, [2])
+        for _, output in jobs:
+            self.assertGreater(os.path.getsize(output), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
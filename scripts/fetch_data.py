@@ -28,15 +28,136 @@ Sources : INSEE (API SDMX), Banque de France, DARES, Eurostat
 - Heures de travail (janvier - prix produits emblématiques)
 """
 
+import argparse
+import asyncio
+import functools
+import gzip
+import heapq
+import io
 import json
+import sys
+import threading
+import time
 import urllib.request
 import urllib.error
 import urllib.parse
 import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
 import os
 import re
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # requests absent : urllib, une connexion par appel
+    requests = None
+
+try:
+    from lxml import etree as LXML_ETREE
+except ImportError:  # lxml absent : ElementTree.iterparse (stdlib)
+    LXML_ETREE = None
+
+XML_PARSE_ERRORS = (ET.ParseError,) if LXML_ETREE is None else (ET.ParseError, LXML_ETREE.XMLSyntaxError)
+
+try:
+    import orjson
+except ImportError:  # orjson absent : ujson, sinon module json standard
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def loads_json(raw):
+    """Décode une réponse JSON (bytes ou str) avec orjson si disponible."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity ou entiers > 64 bits : acceptés par le module standard
+    return json.loads(raw)
+
+
+def dumps_json(data):
+    """
+    Sérialise data.json en UTF-8 indenté (2 espaces) : orjson si disponible, sinon
+    ujson, sinon json standard — même sortie, sauf NaN écrit null (JSON valide) par orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # entiers > 64 bits, types non gérés : module standard
+    elif ujson is not None:
+        try:
+            return ujson.dumps(data, ensure_ascii=False, indent=2, escape_forward_slashes=False).encode('utf-8')
+        except (OverflowError, TypeError):
+            pass  # entiers > 64 bits, types non gérés : module standard
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+# Erreurs réseau (hors statut HTTP) des deux clients
+NETWORK_ERRORS = (urllib.error.URLError,) if requests is None else (urllib.error.URLError, requests.RequestException)
+
+_http_lock = threading.Lock()
+_http_session = None
+
+
+def get_http_session():
+    """
+    Session requests partagée (connexions keep-alive vers INSEE, Eurostat, DARES,
+    FRED... réutilisées d'un appel à l'autre au lieu d'une poignée de main TCP+TLS
+    par requête). None si requests n'est pas installé.
+    """
+    global _http_session
+    if requests is None:
+        return None
+    if _http_session is None:
+        with _http_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def urllib_request(url, headers):
+    """
+    Requête urllib demandant une réponse gzip (requests le fait déjà par défaut) :
+    le XML SDMX et le JSON des API se compressent 5 à 10 fois.
+    """
+    return urllib.request.Request(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+
+
+def read_urllib_body(response):
+    """Corps d'une réponse urllib, décompressé si le serveur l'a envoyé en gzip."""
+    body = response.read()
+    if response.headers.get('Content-Encoding') == 'gzip':
+        return gzip.decompress(body)
+    return body
+
+
+def http_get(url, headers, timeout):
+    """
+    GET via la session partagée (urllib à défaut) : corps de la réponse en bytes.
+    Lève urllib.error.HTTPError sur un statut d'erreur, comme urlopen.
+    """
+    session = get_http_session()
+    if session is None:
+        with urllib.request.urlopen(urllib_request(url, headers), timeout=timeout) as response:
+            return read_urllib_body(response)
+    r = session.get(url, headers=headers, timeout=timeout)
+    if r.status_code >= 400:
+        raise urllib.error.HTTPError(url, r.status_code, r.reason, r.headers, None)
+    return r.content
+
+
 def normalize_zero(value):
     """Évite les -0.0 qui posent problème en JavaScript."""
     return 0.0 if value == 0 else value
@@ -147,21 +268,20 @@ def fetch_dares_dataset(dataset_id, limit=100):
     url = f"{DARES_BASE_URL}/catalog/datasets/{dataset_id}/records?limit={limit}&offset={offset}"
 
     try:
-        req = urllib.request.Request(url, headers={
+        data = loads_json(http_get(url, {
             "Accept":     "application/json",
             "User-Agent": "CFTC-Dashboard/2.0",
-        })
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            results = data.get("results", [])
-            if results:
-                print(f"  ✅ DARES {dataset_id}: {len(results)} enregistrements")
-            return results if results else None
+        }, 30))
+        results = data.get("results", [])
+        if results:
+            print(f"  ✅ DARES {dataset_id}: {len(results)} enregistrements")
+        return results if results else None
     except urllib.error.HTTPError as e:
         print(f"  ⚠️ HTTP {e.code} dataset DARES {dataset_id}")
         return None
-    except urllib.error.URLError as e:
-        print(f"  ⚠️ Réseau dataset DARES {dataset_id}: {e.reason}")
+    except NETWORK_ERRORS as e:
+        reason = str(e.reason) if hasattr(e, "reason") else str(e)
+        print(f"  ⚠️ Réseau dataset DARES {dataset_id}: {reason}")
         return None
     except Exception as e:
         print(f"  ⚠️ Erreur dataset DARES {dataset_id}: {e}")
@@ -172,12 +292,10 @@ def fetch_dares_dataset_offset(dataset_id, limit=100, offset=0):
     """Récupère des enregistrements DARES avec offset pour la pagination."""
     url = f"{DARES_BASE_URL}/catalog/datasets/{dataset_id}/records?limit={limit}&offset={offset}"
     try:
-        req = urllib.request.Request(url, headers={
+        data = loads_json(http_get(url, {
             "Accept": "application/json", "User-Agent": "CFTC-Dashboard/2.0"
-        })
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            return data.get("results", []) or None
+        }, 30))
+        return data.get("results", []) or None
     except Exception:
         return None
 
@@ -193,16 +311,14 @@ def fetch_dares_dataset_filtered(dataset_id, where="", limit=100):
         params["where"] = where
     url = f"{DARES_BASE_URL}/catalog/datasets/{dataset_id}/records?{urllib.parse.urlencode(params)}"
     try:
-        req = urllib.request.Request(url, headers={
+        data = loads_json(http_get(url, {
             "Accept":     "application/json",
             "User-Agent": "CFTC-Dashboard/2.0",
-        })
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            results = data.get("results", [])
-            if results:
-                print(f"  ✅ DARES {dataset_id}: {len(results)} enregistrements (filtré)")
-            return results if results else None
+        }, 30))
+        results = data.get("results", [])
+        if results:
+            print(f"  ✅ DARES {dataset_id}: {len(results)} enregistrements (filtré)")
+        return results if results else None
     except urllib.error.HTTPError as e:
         print(f"  ⚠️ HTTP {e.code} dataset DARES {dataset_id} (filtré)")
         return None
@@ -229,25 +345,22 @@ def fetch_dares_all_records(dataset_id):
         url = f"{DARES_BASE_URL}/catalog/datasets/{dataset_id}/records?limit={limit}&offset={offset}&order_by=date%20desc"
         
         try:
-            req = urllib.request.Request(url, headers={
+            data = loads_json(http_get(url, {
                 'Accept': 'application/json',
                 'User-Agent': 'CFTC-Dashboard/1.0'
-            })
+            }, 30))
+            records = data.get('results', [])
             
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                records = data.get('results', [])
-                
-                if not records:
-                    break
-                
-                all_records.extend(records)
-                offset += limit
+            if not records:
+                break
+            
+            all_records.extend(records)
+            offset += limit
+            
+            # Sécurité : limite à 1000 enregistrements max
+            if offset >= 1000:
+                break
                 
-                # Sécurité : limite à 1000 enregistrements max
-                if offset >= 1000:
-                    break
-                    
         except Exception as e:
             print(f"  ⚠️ Erreur pagination DARES: {e}")
             break
@@ -464,15 +577,13 @@ def build_emplois_vacants_data():
         url = (f"{base}?select=date,avg(taux_d_emplois_vacants_en)%20as%20taux_moy"
                f"&group_by=date&order_by=date%20asc&limit=100")
         try:
-            req = urllib.request.Request(url, headers={
+            data = loads_json(http_get(url, {
                 "Accept": "application/json", "User-Agent": "CFTC-Dashboard/2.0"
-            })
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                results = data.get("results", [])
-                if results:
-                    print(f"  ✅ DARES taux: {len(results)} trimestres")
-                return results if results else None
+            }, 30))
+            results = data.get("results", [])
+            if results:
+                print(f"  ✅ DARES taux: {len(results)} trimestres")
+            return results if results else None
         except Exception as e:
             print(f"  ⚠️ DARES taux indisponible: {e}")
             return None
@@ -597,76 +708,534 @@ def build_emplois_vacants_par_secteur():
 # FONCTIONS DE RÉCUPÉRATION DES DONNÉES
 # ============================================================================
 
+# Débit maximal toléré par l'INSEE (~20 req/min) : un départ de requête toutes les 3s,
+# partagé entre les threads du préchargement parallèle.
+INSEE_MIN_INTERVAL = 3.0
+INSEE_MAX_CONCURRENT = 10
+# Séries par requête groupée (id1+id2+...) : garde des URL de taille raisonnable
+INSEE_BATCH_SIZE = 20
+_insee_lock = threading.Lock()
+_insee_next_slot = 0.0
+
+# Cache disque des séries parsées : les séries IPC/BIT ne changent qu'au mieux une fois
+# par mois, inutile de les retélécharger à chaque relance locale ou CI.
+# INSEE_CACHE_TTL=0 (ou --no-cache, main(cache_ttl=0)) désactive le cache. Les séries
+# annuelles (périodes "AAAA") ne bougent qu'une fois par an : elles sont gardées
+# INSEE_CACHE_TTL_ANNUAL.
+INSEE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'insee')
+INSEE_CACHE_TTL = int(os.environ.get('INSEE_CACHE_TTL', 6 * 3600))
+INSEE_CACHE_TTL_ANNUAL = int(os.environ.get('INSEE_CACHE_TTL_ANNUAL', 24 * 3600))
+# TTL appliqué pendant l'exécution : INSEE_CACHE_TTL, ou celui passé à main(cache_ttl=...)
+_insee_cache_ttl = INSEE_CACHE_TTL
+
+# Séries INSEE déjà récupérées, par (series_id, start_period) — prefetch_insee_series
+# et fetch_insee_series ; les échecs (None) sont mémorisés aussi
+_insee_cache = {}
+
+# ETag / Last-Modified par URL, pour les GET conditionnels une fois le TTL dépassé
+INSEE_VALIDATORS_PATH = os.path.join(INSEE_CACHE_DIR, 'validators.json')
+_insee_validators = None
+
+# Préchargement en tâche de fond (start_insee_prefetch) : séries attendues et fin du thread
+_insee_prefetch_pending = frozenset()
+_insee_prefetch_done = threading.Event()
+_insee_prefetch_done.set()
+
+
+def series_cache_path(series_id, start_period):
+    return os.path.join(INSEE_CACHE_DIR, f"{series_id}_{start_period}.json")
+
+
+def load_cached_series(series_id, start_period):
+    """
+    Observations parsées d'une série si le cache disque a moins de _insee_cache_ttl
+    secondes (INSEE_CACHE_TTL_ANNUAL pour une série annuelle).
+    """
+    if _insee_cache_ttl <= 0:
+        return None
+    path = series_cache_path(series_id, start_period)
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if age >= max(_insee_cache_ttl, INSEE_CACHE_TTL_ANNUAL):
+            return None
+    except OSError:
+        return None
+    observations = read_cached_series(series_id, start_period)
+    if observations is None:
+        return None
+    if age >= _insee_cache_ttl:
+        annual = observations and len(observations[-1]['period']) == 4
+        if not annual or age >= INSEE_CACHE_TTL_ANNUAL:
+            return None
+    return observations
+
+
+def read_cached_series(series_id, start_period):
+    """Observations du cache disque quel que soit leur âge (None si absentes)."""
+    if _insee_cache_ttl <= 0:
+        return None
+    try:
+        with open(series_cache_path(series_id, start_period), 'rb') as f:
+            return loads_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_series(series_id, start_period, observations):
+    """Enregistre les observations parsées (pas le XML : on évite de le re-parser)."""
+    if _insee_cache_ttl <= 0:
+        return
+    try:
+        os.makedirs(INSEE_CACHE_DIR, exist_ok=True)
+        path = series_cache_path(series_id, start_period)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(observations, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"  ⚠️ Cache INSEE non écrit pour {series_id}: {e}")
+
+
+def insee_get(url, headers, timeout):
+    """
+    GET sur l'API INSEE : (corps, en-têtes de réponse), corps None sur un 304 Not
+    Modified ; lève urllib.error.HTTPError sur un statut d'erreur.
+    """
+    session = get_http_session()
+    if session is None:
+        try:
+            with urllib.request.urlopen(urllib_request(url, headers), timeout=timeout) as response:
+                return read_urllib_body(response), response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, e.headers
+            raise
+    r = session.get(url, headers=headers, timeout=timeout)
+    if r.status_code == 304:
+        return None, r.headers
+    if r.status_code >= 400:
+        raise urllib.error.HTTPError(url, r.status_code, r.reason, r.headers, None)
+    return r.content, r.headers
+
+
+def insee_validators():
+    """
+    Validateurs HTTP (ETag, Last-Modified) des dernières réponses INSEE, par URL,
+    chargés une fois depuis le cache disque.
+    """
+    global _insee_validators
+    with _insee_lock:
+        if _insee_validators is None:
+            try:
+                with open(INSEE_VALIDATORS_PATH, 'rb') as f:
+                    _insee_validators = loads_json(f.read())
+            except (OSError, ValueError):
+                _insee_validators = {}
+        return _insee_validators
+
+
+def remember_validators(url, response_headers):
+    """Mémorise ETag / Last-Modified d'une réponse pour le prochain GET conditionnel."""
+    if _insee_cache_ttl <= 0:
+        return
+    entry = {
+        name: response_headers.get(name)
+        for name in ("ETag", "Last-Modified")
+        if response_headers.get(name)
+    }
+    validators = insee_validators()
+    with _insee_lock:
+        if entry:
+            validators[url] = entry
+        elif validators.pop(url, None) is None:
+            return
+        try:
+            os.makedirs(INSEE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{INSEE_VALIDATORS_PATH}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(validators, f)
+            os.replace(tmp_path, INSEE_VALIDATORS_PATH)
+        except OSError as e:
+            print(f"  ⚠️ Validateurs INSEE non écrits : {e}")
+
+
+def wait_insee_slot():
+    """Attend le prochain créneau libre pour appeler l'INSEE (espacement de 3s entre départs)."""
+    global _insee_next_slot
+    with _insee_lock:
+        now = time.monotonic()
+        slot = max(now, _insee_next_slot)
+        _insee_next_slot = slot + INSEE_MIN_INTERVAL
+    time.sleep(slot - now)
+
+
 def fetch_insee_series(series_id, start_period="2015"):
     """
-    Récupère une série INSEE SDMX avec retry et délai anti-rate-limit.
-    L'INSEE bloque les appels en rafale depuis GitHub Actions (connection reset).
-    Solution : délai fixe de 3s avant chaque appel + 3 tentatives avec backoff.
+    Récupère une série INSEE SDMX, mémorisée par (series_id, start_period) pour toute
+    l'exécution : préchargement ou appel précédent, une série n'est téléchargée qu'une fois.
+    La liste renvoyée est partagée entre appelants : la lire sans la modifier.
     """
-    import time as _time
+    key = (series_id, start_period)
+    if key not in _insee_cache and key in _insee_prefetch_pending:
+        _insee_prefetch_done.wait()
+    if key not in _insee_cache:
+        _insee_cache[key] = download_insee_series(series_id, start_period)
+    return _insee_cache[key]
+
+
+def download_insee_series(series_id, start_period="2015"):
+    """Télécharge une série INSEE SDMX (cache disque d'abord)."""
+    cached = load_cached_series(series_id, start_period)
+    if cached is not None:
+        return cached
+
     url = f"{INSEE_BASE_URL}/{series_id}?startPeriod={start_period}"
+    stale = read_cached_series(series_id, start_period)
+    result = request_insee(url, f"Série {series_id}", parse_sdmx_response, stale)
+    if result:
+        save_cached_series(series_id, start_period, result)
+    return result
+
+
+def download_insee_batch(series_ids, start_period="2015", stale=None):
+    """
+    Télécharge plusieurs séries en une seule requête (syntaxe SDMX id1+id2+...).
+    Renvoie {series_id: observations} ; les séries absentes de la réponse n'y
+    figurent pas. stale : {series_id: observations} déjà en cache, renvoyé si
+    l'INSEE répond 304.
+    """
+    url = f"{INSEE_BASE_URL}/{'+'.join(series_ids)}?startPeriod={start_period}"
+    return request_insee(url, f"Lot de {len(series_ids)} séries", parse_sdmx_series, stale) or {}
+
+
+def request_insee(url, label, parse, stale=None):
+    """
+    Appelle l'API INSEE avec retry et délai anti-rate-limit, et renvoie parse(xml)
+    (None après 3 échecs).
+    L'INSEE bloque les appels en rafale depuis GitHub Actions (connection reset).
+    Solution : 3s minimum entre deux départs de requête + 3 tentatives avec backoff.
+    Si stale (résultat d'un appel précédent, resté sur disque) est fourni, le GET est
+    conditionnel (If-None-Match / If-Modified-Since) et un 304 renvoie stale.
+    """
     headers = {
         "Accept": "application/vnd.sdmx.structurespecificdata+xml;version=2.1",
         "User-Agent": "CFTC-Dashboard/2.0",
     }
+    if stale:
+        validators = insee_validators().get(url, {})
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
     timeouts = [10, 20, 30]
     delays   = [3, 6]  # pauses entre tentatives
 
-    # Délai fixe avant chaque appel pour éviter le rate-limit INSEE (~20 req/min)
-    _time.sleep(3)
-
     for attempt, timeout in enumerate(timeouts, 1):
+        # Créneau anti-rate-limit INSEE (~20 req/min), y compris pour les nouvelles tentatives
+        wait_insee_slot()
         try:
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                xml_data = response.read()
-                result = parse_sdmx_response(xml_data)
-                if result:
-                    if attempt > 1:
-                        print(f"  ✅ Série {series_id} obtenue à la tentative {attempt}")
-                    return result
+            xml_data, response_headers = insee_get(url, headers, timeout)
+            if xml_data is None:
+                print(f"  ✓ {label} inchangée depuis le dernier appel (304)")
+                return stale
+            result = parse(xml_data)
+            if result:
+                remember_validators(url, response_headers)
+                if attempt > 1:
+                    print(f"  ✅ {label} obtenue à la tentative {attempt}")
+                return result
         except urllib.error.HTTPError as e:
-            print(f"  ⚠️ HTTP {e.code} série {series_id} (tentative {attempt}/3)")
+            print(f"  ⚠️ HTTP {e.code} {label} (tentative {attempt}/3)")
             if e.code in (400, 404, 410):
                 break
-        except urllib.error.URLError as e:
+        except NETWORK_ERRORS as e:
             reason = str(e.reason) if hasattr(e, "reason") else str(e)
-            print(f"  ⚠️ Réseau série {series_id} (tentative {attempt}/3): {reason}")
+            print(f"  ⚠️ Réseau {label} (tentative {attempt}/3): {reason}")
         except Exception as e:
-            print(f"  ⚠️ Erreur série {series_id} (tentative {attempt}/3): {e}")
+            print(f"  ⚠️ Erreur {label} (tentative {attempt}/3): {e}")
 
         if attempt < len(timeouts):
-            _time.sleep(delays[attempt - 1])
+            time.sleep(delays[attempt - 1])
 
-    print(f"  ⚠️ Série {series_id} indisponible après 3 tentatives — données par défaut")
+    print(f"  ⚠️ {label} indisponible après 3 tentatives — données par défaut")
     return None
 
 
+async def gather_insee_series(download, args_list):
+    """
+    Lance download(*args) pour chaque élément de args_list et attend les résultats
+    (exceptions comprises). urllib étant bloquant, chaque requête tourne dans un pool
+    dédié de INSEE_MAX_CONCURRENT threads (le pool par défaut d'asyncio dépend du
+    nombre de CPU).
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=INSEE_MAX_CONCURRENT) as executor:
+        return await asyncio.gather(
+            *[loop.run_in_executor(executor, download, *args) for args in args_list],
+            return_exceptions=True,
+        )
+
+
+# Séries lues par les build_* de main(), avec la période de départ qu'ils demandent
+INSEE_PREFETCH = [(SERIES_IDS[name], start) for name, start in [
+    ("decile_d1_prive", "2015"), ("decile_d5_prive", "2015"), ("decile_d9_prive", "2015"),
+    ("interdecile_d9d1", "2015"), ("interdecile_d5d1", "2015"),
+    ("itb_ensemble", "2000"), ("itb_cat_a", "2000"), ("itb_cat_b", "2000"), ("itb_cat_c", "2000"),
+    ("chomage_guadeloupe", "2022"), ("chomage_martinique", "2022"),
+    ("chomage_guyane", "2022"), ("chomage_reunion", "2022"),
+    ("inflation_ensemble", "2020"),
+    ("chomage_total", "2023"), ("chomage_jeunes", "2023"), ("chomage_seniors", "2023"),
+    ("part_cdd_interim", "2023"), ("difficultes_recrutement", "2023"),
+    ("emploi_industrie", "2023"), ("emploi_construction", "2023"),
+    ("emploi_tertiaire_marchand", "2023"), ("emploi_tertiaire_nonmarc", "2023"),
+    ("irl", "2022"), ("irl_glissement", "2022"), ("prix_immobilier", "2022"),
+    # Repli de build_carburants_data si l'API prix-carburants ne répond pas : sans
+    # requête de plus, les deux séries tiennent dans les lots
+    ("prix_gazole", "2023"), ("prix_sp95", "2023"),
+    ("pib_volume", "2020"),
+    ("climat_affaires", "2024"), ("confiance_menages", "2024"),
+    ("defaillances_cumul", "2023"),
+    ("smb_industrie", "2023"), ("smb_construction", "2023"), ("smb_tertiaire", "2023"),
+    ("salaire_net_femmes", "2015"), ("salaire_net_hommes", "2015"),
+]]
+
+
+def prefetch_insee_series(series_list):
+    """
+    Télécharge les séries (series_id, start_period) utilisées par les build_*.
+    Toutes sont demandées ensemble par lots de INSEE_BATCH_SIZE, depuis la plus
+    ancienne période de départ, puis chaque série est recoupée à sa propre période ;
+    celles qu'un lot n'a pas ramenées sont reprises une à une. Les requêtes partent
+    en parallèle, espacées de 3s. Les build_* lisent ensuite les résultats via
+    fetch_insee_series.
+    """
+    todo = [key for key in dict.fromkeys(series_list) if key not in _insee_cache]
+    if not todo:
+        return
+    print(f"⏬ Préchargement de {len(todo)} séries INSEE...")
+
+    missing = []
+    for key in todo:
+        cached = load_cached_series(*key)
+        if cached is not None:
+            _insee_cache[key] = cached
+        else:
+            missing.append(key)
+    batches = []
+    if len(missing) > 1:
+        # Quelques observations anciennes en trop coûtent moins qu'une requête
+        # (et 3s de créneau) par période de départ
+        series_ids = list(dict.fromkeys(series_id for series_id, _ in missing))
+        oldest = min(start_period for _, start_period in missing)
+        # Dernières observations connues (la plus ancienne période de départ l'emporte) :
+        # un lot dont toutes les séries sont sur disque peut être demandé en GET conditionnel
+        known = {}
+        for series_id, start_period in sorted(missing, key=itemgetter(1), reverse=True):
+            observations = read_cached_series(series_id, start_period)
+            if observations:
+                known[series_id] = observations
+        batches = []
+        for i in range(0, len(series_ids), INSEE_BATCH_SIZE):
+            ids = series_ids[i:i + INSEE_BATCH_SIZE]
+            stale = {series_id: known[series_id] for series_id in ids if series_id in known}
+            batches.append((ids, oldest, stale if len(stale) == len(ids) else None))
+        fetched = {}
+        for result in asyncio.run(gather_insee_series(download_insee_batch, batches)):
+            if isinstance(result, BaseException):
+                print(f"  ⚠️ Lot INSEE : {result}")
+                continue
+            fetched.update(result)
+        for series_id, start_period in missing:
+            # Périodes "AAAA", "AAAA-MM" ou "AAAA-Qn" : la comparaison de chaînes
+            # avec l'année de départ suffit
+            observations = [obs for obs in fetched.get(series_id, ()) if obs['period'] >= start_period]
+            if observations:
+                _insee_cache[(series_id, start_period)] = observations
+                save_cached_series(series_id, start_period, observations)
+
+    remaining = [key for key in todo if key not in _insee_cache]
+    if remaining:
+        results = asyncio.run(gather_insee_series(download_insee_series, remaining))
+        for key, result in zip(remaining, results):
+            if isinstance(result, BaseException):
+                print(f"  ⚠️ Série {key[0]} : {result}")
+                continue
+            # Les échecs (None) sont conservés : inutile de refaire 3 tentatives dans le build_*
+            _insee_cache[key] = result
+    ok = sum(bool(_insee_cache.get(key)) for key in todo)
+    print(f"  ✓ {ok}/{len(todo)} séries INSEE préchargées ({len(batches)} lots, {len(remaining)} requêtes unitaires)")
+    print()
+
+
+def start_insee_prefetch(series_list):
+    """
+    Lance prefetch_insee_series dans un thread : les appels Eurostat, DARES, etc. du
+    début de main() avancent pendant que les requêtes INSEE attendent leur créneau.
+    fetch_insee_series attend la fin du préchargement pour les séries qu'il couvre.
+    """
+    global _insee_prefetch_pending
+    _insee_prefetch_pending = frozenset(series_list)
+    _insee_prefetch_done.clear()
+
+    def run():
+        try:
+            prefetch_insee_series(series_list)
+        finally:
+            _insee_prefetch_done.set()
+
+    threading.Thread(target=run, name="insee-prefetch", daemon=True).start()
+
+
+def iter_sdmx_obs(xml_data):
+    """
+    Parcourt les éléments <Obs> en flux (parseur lxml en C si installé, sinon
+    ElementTree.iterparse) en libérant chaque observation après lecture.
+    Produit des couples (IDBANK de la <Series> englobante, obs).
+    """
+    source = io.BytesIO(xml_data)
+    if LXML_ETREE is not None:
+        # Le proxy de la <Series> parente est conservé : lxml renvoie le même objet
+        # tant qu'il est référencé, l'IDBANK n'est donc relu qu'à chaque nouvelle série
+        series = idbank = None
+        for _, obs in LXML_ETREE.iterparse(source, events=('end',), tag='{*}Obs'):
+            parent = obs.getparent()
+            if parent is not series:
+                series = parent
+                idbank = parent.get('IDBANK')
+            yield idbank, obs
+            obs.clear()
+            while obs.getprevious() is not None:
+                del parent[0]
+        return
+    # ElementTree n'a ni filtre par balise ni lien vers le parent : le nom local n'est
+    # calculé qu'une fois par balise distincte, et l'IDBANK est relevé à l'ouverture
+    # de chaque <Series>
+    local_names = {}
+    idbank = None
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        tag = elem.tag
+        name = local_names.get(tag)
+        if name is None:
+            name = local_names[tag] = tag.rpartition('}')[2]
+        if event == 'start':
+            if name == 'Series':
+                idbank = elem.get('IDBANK')
+        elif name == 'Obs':
+            yield idbank, elem
+            elem.clear()
+
+
+def collect_sdmx_columns(xml_data):
+    """
+    Relève (périodes, valeurs) par IDBANK pendant le parcours ; les dicts ne sont
+    construits qu'une fois, dans l'ordre final.
+    """
+    # Les <Obs> d'une même série se suivent : la colonne courante est gardée sous la
+    # main, et les valeurs brutes ne sont converties en float qu'une fois la série lue
+    raw_columns = {}
+    current_idbank = column = None
+    for idbank, obs in iter_sdmx_obs(xml_data):
+        time_period = obs.get('TIME_PERIOD') or obs.get('TIME')
+        obs_value = obs.get('OBS_VALUE') or obs.get('value')
+        
+        if time_period and obs_value:
+            if column is None or idbank != current_idbank:
+                current_idbank = idbank
+                column = raw_columns.setdefault(idbank, ([], []))
+            column[0].append(time_period)
+            column[1].append(obs_value)
+    return {idbank: to_float_column(periods, raw) for idbank, (periods, raw) in raw_columns.items()}
+
+
+def to_float_column(periods, raw_values):
+    """Convertit les valeurs brutes ; les observations non numériques sont écartées."""
+    try:
+        return periods, list(map(float, raw_values))
+    except ValueError:
+        pass
+    kept_periods = []
+    values = []
+    for period, raw in zip(periods, raw_values):
+        try:
+            values.append(float(raw))
+        except ValueError:
+            continue
+        kept_periods.append(period)
+    return kept_periods, values
+
+
+def ordered_observations(periods, values):
+    """Observations {'period', 'value'} triées par période croissante."""
+    # L'INSEE renvoie les observations déjà ordonnées (souvent de la plus récente
+    # à la plus ancienne) : un simple renversement suffit alors
+    if all(nxt >= cur for nxt, cur in zip(periods[1:], periods)):
+        return [{'period': p, 'value': v} for p, v in zip(periods, values)]
+    if all(nxt < cur for nxt, cur in zip(periods[1:], periods)):
+        return [{'period': p, 'value': v} for p, v in zip(reversed(periods), reversed(values))]
+    
+    # Sinon, tri des couples (période, valeur) sur la période avant de construire les dicts
+    pairs = sorted(zip(periods, values), key=itemgetter(0))
+    return [{'period': p, 'value': v} for p, v in pairs]
+
+
 def parse_sdmx_response(xml_data):
     """Parse la réponse SDMX et extrait les observations"""
     try:
-        root = ET.fromstring(xml_data)
-        observations = []
-        
-        for obs in root.iter():
-            if obs.tag.endswith('Obs') or 'Obs' in obs.tag:
-                time_period = obs.get('TIME_PERIOD') or obs.get('TIME')
-                obs_value = obs.get('OBS_VALUE') or obs.get('value')
-                
-                if time_period and obs_value:
-                    try:
-                        observations.append({
-                            'period': time_period,
-                            'value': float(obs_value)
-                        })
-                    except ValueError:
-                        continue
-        
-        return sorted(observations, key=lambda x: x['period'])
-        
-    except ET.ParseError as e:
+        columns = collect_sdmx_columns(xml_data)
+    except XML_PARSE_ERRORS as e:
+        print(f"  ⚠️ Erreur parsing XML: {e}")
+        return None
+    if len(columns) == 1:
+        periods, values = next(iter(columns.values()))
+    else:
+        periods = [p for column in columns.values() for p in column[0]]
+        values = [v for column in columns.values() for v in column[1]]
+    return ordered_observations(periods, values)
+
+
+def parse_sdmx_series(xml_data):
+    """Parse une réponse SDMX multi-séries : {IDBANK: observations}."""
+    try:
+        columns = collect_sdmx_columns(xml_data)
+    except XML_PARSE_ERRORS as e:
         print(f"  ⚠️ Erreur parsing XML: {e}")
         return None
+    return {
+        idbank: ordered_observations(periods, values)
+        for idbank, (periods, values) in columns.items()
+        if idbank is not None
+    }
+
+
+# Périodes SDMX : annuelle "2024", trimestrielle "2024-Q1", mensuelle "2024-03"
+PERIOD_RE = re.compile(r'(\d{4})(?:-Q(\d)|-(\d{2}))?')
+
+
+@functools.lru_cache(maxsize=1024)
+def decode_period(period):
+    """Période SDMX → (année, trimestre ou None, mois ou None), None si format inconnu."""
+    m = PERIOD_RE.fullmatch(period)
+    return m.groups() if m else None
+
+
+@functools.lru_cache(maxsize=256)
+def format_trimestre(period):
+    """Période SDMX trimestrielle → libellé ("2024-Q1" → "T1 2024"), inchangée sinon."""
+    decoded = decode_period(period)
+    if decoded is None or decoded[1] is None:
+        return period
+    return f"T{decoded[1]} {decoded[0]}"
+
+
+MOIS_FR = ("Jan", "Fév", "Mar", "Avr", "Mai", "Juin",
+           "Juil", "Août", "Sep", "Oct", "Nov", "Déc")
+
+
+@functools.lru_cache(maxsize=256)
+def format_mois(period):
+    """Période SDMX mensuelle → libellé ("2024-03" → "Mar 2024")."""
+    year, month = period.split('-')
+    return f"{MOIS_FR[int(month)-1]} {year}"
 
 
 def get_quarterly_values(series_id, start_year=2023):
@@ -675,17 +1244,20 @@ def get_quarterly_values(series_id, start_year=2023):
     if not data:
         return []
     
-    result = []
-    for obs in data:
-        period = obs['period']
-        if '-Q' in period:
-            year, quarter = period.split('-Q')
-            trimestre = f"T{quarter} {year}"
-        else:
-            trimestre = period
-        result.append({'trimestre': trimestre, 'valeur': obs['value']})
-    
-    return result
+    return [{'trimestre': format_trimestre(obs['period']), 'valeur': obs['value']} for obs in data]
+
+
+def annual_means(observations):
+    """
+    Moyenne annuelle d'une série infra-annuelle : {année: moyenne}.
+    Une seule passe qui cumule (somme, nombre) par année, sans liste intermédiaire.
+    """
+    acc = defaultdict(lambda: [0.0, 0])
+    for obs in observations:
+        year_acc = acc[obs['period'][:4]]
+        year_acc[0] += obs['value']
+        year_acc[1] += 1
+    return {year: total / count for year, (total, count) in acc.items()}
 
 
 def get_annual_values(series_id, start_year=2015):
@@ -706,6 +1278,13 @@ def get_annual_values(series_id, start_year=2015):
 # RÉCUPÉRATION AUTOMATIQUE DU CHÔMAGE DROM
 # ============================================================================
 
+def annual_value(value):
+    """Valeur annuelle, ou moyenne arrondie des trimestres relevés pour l'année."""
+    if isinstance(value, list):
+        return round(sum(value) / len(value), 1)
+    return value
+
+
 def fetch_chomage_drom():
     """
     Récupère automatiquement le taux de chômage annuel pour les 4 DROM
@@ -743,33 +1322,31 @@ def fetch_chomage_drom():
         # Certaines peuvent aussi arriver en trimestriel : on fait la moyenne annuelle
         annual = {}
         for obs in data:
-            period = obs["period"]
-            if len(period) == 4 and period.isdigit():
-                annual[period] = obs["value"]
-            elif "-Q" in period:
-                year = period[:4]
+            decoded = decode_period(obs["period"])
+            if decoded is None or decoded[2] is not None:
+                continue
+            year, quarter, _ = decoded
+            if quarter is None:
+                annual[year] = obs["value"]
+            else:
                 if year not in annual:
                     annual[year] = []
                 if isinstance(annual[year], list):
                     annual[year].append(obs["value"])
 
-        # Finaliser les moyennes annuelles si trimestriel
-        for year in list(annual.keys()):
-            if isinstance(annual[year], list) and annual[year]:
-                annual[year] = round(sum(annual[year]) / len(annual[year]), 1)
-
         sorted_years = sorted(annual.keys())
         if not sorted_years:
             print(f"  ⚠️ Aucune donnée annuelle pour {code}, valeur statique conservée")
             continue
 
+        # Moyennes annuelles (si trimestriel) des deux seules années utilisées
         latest_year = sorted_years[-1]
-        latest_val = round(annual[latest_year], 1)
+        latest_val = round(annual_value(annual[latest_year]), 1)
 
         # Calcul de l'évolution vs année précédente
         evol = 0.0
         if len(sorted_years) >= 2:
-            prev_val = annual[sorted_years[-2]]
+            prev_val = annual_value(annual[sorted_years[-2]])
             evol = round(latest_val - prev_val, 1)
 
         result[code] = {"chomage": latest_val, "evol_chomage": normalize_zero(evol)}
@@ -782,89 +1359,93 @@ def fetch_chomage_drom():
 # CONSTRUCTION DES DONNÉES - INFLATION
 # ============================================================================
 
+# Repli de build_inflation_data (SMIC et salaires de base repris aussi quand l'INSEE répond)
+DEFAULT_INFLATION = (
+    {"annee": "2020", "inflation": 0.5, "smic": 1.2, "salaires_base": 1.5},
+    {"annee": "2021", "inflation": 1.6, "smic": 2.2, "salaires_base": 1.4},
+    {"annee": "2022", "inflation": 5.2, "smic": 5.6, "salaires_base": 3.5},
+    {"annee": "2023", "inflation": 4.9, "smic": 6.6, "salaires_base": 4.2},
+    {"annee": "2024", "inflation": 2.0, "smic": 2.0, "salaires_base": 2.8},
+    {"annee": "2025", "inflation": 0.9, "smic": 1.2, "salaires_base": 2.0},
+)
+
+
 def build_inflation_data():
     """Construit les données d'inflation"""
     print("📊 Récupération des données d'inflation...")
     
-    default_inflation = [
-        {"annee": "2020", "inflation": 0.5, "smic": 1.2, "salaires_base": 1.5},
-        {"annee": "2021", "inflation": 1.6, "smic": 2.2, "salaires_base": 1.4},
-        {"annee": "2022", "inflation": 5.2, "smic": 5.6, "salaires_base": 3.5},
-        {"annee": "2023", "inflation": 4.9, "smic": 6.6, "salaires_base": 4.2},
-        {"annee": "2024", "inflation": 2.0, "smic": 2.0, "salaires_base": 2.8},
-        {"annee": "2025", "inflation": 0.9, "smic": 1.2, "salaires_base": 2.0},
-    ]
-    
     data = fetch_insee_series(SERIES_IDS["inflation_ensemble"], "2020")
     if data:
-        annual_avg = {}
-        for obs in data:
-            year = obs['period'][:4]
-            if year not in annual_avg:
-                annual_avg[year] = []
-            annual_avg[year].append(obs['value'])
+        annual_avg = annual_means(data)
+        default_by_year = {d['annee']: d for d in DEFAULT_INFLATION}
         
-        years = sorted(annual_avg.keys())
         inflation_annuelle = []
-        for i, year in enumerate(years):
-            if i > 0:
-                prev_year = years[i-1]
-                current_avg = sum(annual_avg[year]) / len(annual_avg[year])
-                prev_avg = sum(annual_avg[prev_year]) / len(annual_avg[prev_year])
-                inflation = round(((current_avg / prev_avg) - 1) * 100, 1)
-                
-                default_entry = next((d for d in default_inflation if d['annee'] == year), None)
+        prev_avg = None
+        for year, current_avg in sorted(annual_avg.items()):
+            # Moyenne de l'année précédente reprise du tour précédent
+            if prev_avg is not None:
+                default_entry = default_by_year.get(year)
                 if default_entry:
                     inflation_annuelle.append({
                         "annee": year,
-                        "inflation": inflation,
+                        "inflation": round(((current_avg / prev_avg) - 1) * 100, 1),
                         "smic": default_entry['smic'],
                         "salaires_base": default_entry['salaires_base']
                     })
+            prev_avg = current_avg
         
         if inflation_annuelle:
             print(f"  ✓ {len(inflation_annuelle)} années d'inflation récupérées")
             return inflation_annuelle
     
     print("  ⚠️ Utilisation des données par défaut")
-    return default_inflation
+    return [dict(d) for d in DEFAULT_INFLATION]
 
 
 # ============================================================================
 # CONSTRUCTION DES DONNÉES - CHÔMAGE
 # ============================================================================
 
+# Repli de build_chomage_data
+DEFAULT_CHOMAGE = (
+    {"trimestre": "T1 2023", "taux": 7.1, "jeunes": 17.5},
+    {"trimestre": "T2 2023", "taux": 7.2, "jeunes": 17.0},
+    {"trimestre": "T3 2023", "taux": 7.4, "jeunes": 17.6},
+    {"trimestre": "T4 2023", "taux": 7.5, "jeunes": 17.6},
+    {"trimestre": "T1 2024", "taux": 7.5, "jeunes": 18.1},
+    {"trimestre": "T2 2024", "taux": 7.3, "jeunes": 17.7},
+    {"trimestre": "T3 2024", "taux": 7.4, "jeunes": 18.3},
+    {"trimestre": "T4 2024", "taux": 7.3, "jeunes": 19.0},
+    {"trimestre": "T1 2025", "taux": 7.4, "jeunes": 18.5},
+    {"trimestre": "T2 2025", "taux": 7.5, "jeunes": 18.8},
+    {"trimestre": "T3 2025", "taux": 7.7, "jeunes": 19.2},
+)
+
+
 def build_chomage_data():
     """Construit les données de chômage"""
     print("📊 Récupération des données de chômage...")
     
-    default_chomage = [
-        {"trimestre": "T1 2023", "taux": 7.1, "jeunes": 17.5},
-        {"trimestre": "T2 2023", "taux": 7.2, "jeunes": 17.0},
-        {"trimestre": "T3 2023", "taux": 7.4, "jeunes": 17.6},
-        {"trimestre": "T4 2023", "taux": 7.5, "jeunes": 17.6},
-        {"trimestre": "T1 2024", "taux": 7.5, "jeunes": 18.1},
-        {"trimestre": "T2 2024", "taux": 7.3, "jeunes": 17.7},
-        {"trimestre": "T3 2024", "taux": 7.4, "jeunes": 18.3},
-        {"trimestre": "T4 2024", "taux": 7.3, "jeunes": 19.0},
-        {"trimestre": "T1 2025", "taux": 7.4, "jeunes": 18.5},
-        {"trimestre": "T2 2025", "taux": 7.5, "jeunes": 18.8},
-        {"trimestre": "T3 2025", "taux": 7.7, "jeunes": 19.2},
-    ]
-    
-    chomage_total = get_quarterly_values(SERIES_IDS["chomage_total"], 2023)
-    chomage_jeunes = get_quarterly_values(SERIES_IDS["chomage_jeunes"], 2023)
+    chomage_total = fetch_insee_series(SERIES_IDS["chomage_total"], "2023")
+    chomage_jeunes = fetch_insee_series(SERIES_IDS["chomage_jeunes"], "2023")
     
     if chomage_total and chomage_jeunes:
         result = []
-        jeunes_dict = {c['trimestre']: c['valeur'] for c in chomage_jeunes}
-        
+        # Les deux séries sont triées par période : fusion en un seul parcours sur
+        # les périodes SDMX brutes, le libellé "T1 2024" n'est formaté qu'en sortie
+        j, nb_jeunes = 0, len(chomage_jeunes)
         for c in chomage_total:
-            trimestre = c['trimestre']
+            period = c['period']
+            while j < nb_jeunes and chomage_jeunes[j]['period'] < period:
+                j += 1
+            if j < nb_jeunes and chomage_jeunes[j]['period'] == period:
+                jeunes = chomage_jeunes[j]['value']
+            else:
+                jeunes = 18.0
             result.append({
-                "trimestre": trimestre,
-                "taux": round(c['valeur'], 1),
-                "jeunes": round(jeunes_dict.get(trimestre, 18.0), 1)
+                "trimestre": format_trimestre(period),
+                "taux": round(c['value'], 1),
+                "jeunes": round(jeunes, 1)
             })
         
         if result:
@@ -872,7 +1453,7 @@ def build_chomage_data():
             return result
     
     print("  ⚠️ Utilisation des données par défaut")
-    return default_chomage
+    return [dict(c) for c in DEFAULT_CHOMAGE]
 
 
 # ============================================================================
@@ -992,26 +1573,27 @@ def build_emploi_seniors_detail(taux_actuel):
 # CONSTRUCTION DES DONNÉES - TYPES DE CONTRATS (NOUVEAU)
 # ============================================================================
 
+# Repli de build_types_contrats_data (données basées sur les publications INSEE)
+DEFAULT_TYPES_CONTRATS = (
+    {"trimestre": "T1 2023", "cdi": 74.5, "cdd": 8.8, "interim": 2.2},
+    {"trimestre": "T2 2023", "cdi": 74.3, "cdd": 9.0, "interim": 2.1},
+    {"trimestre": "T3 2023", "cdi": 74.4, "cdd": 8.9, "interim": 2.0},
+    {"trimestre": "T4 2023", "cdi": 74.6, "cdd": 8.7, "interim": 2.0},
+    {"trimestre": "T1 2024", "cdi": 74.8, "cdd": 8.5, "interim": 1.9},
+    {"trimestre": "T2 2024", "cdi": 74.7, "cdd": 8.6, "interim": 1.9},
+    {"trimestre": "T3 2024", "cdi": 74.9, "cdd": 8.4, "interim": 1.8},
+    {"trimestre": "T4 2024", "cdi": 75.0, "cdd": 8.3, "interim": 1.8},
+    {"trimestre": "T1 2025", "cdi": 83.6, "cdd": 5.1, "interim": 1.3},
+    {"trimestre": "T2 2025", "cdi": 83.5, "cdd": 5.2, "interim": 1.3},
+    {"trimestre": "T3 2025", "cdi": 83.6, "cdd": 5.1, "interim": 1.3},
+    {"trimestre": "T4 2025", "cdi": 83.4, "cdd": 5.3, "interim": 1.3},
+)
+
+
 def build_types_contrats_data():
     """Construit les données sur les types de contrats (CDI/CDD/Intérim)"""
     print("📊 Récupération des données types de contrats...")
     
-    # Données par défaut basées sur les publications INSEE
-    default_contrats = [
-        {"trimestre": "T1 2023", "cdi": 74.5, "cdd": 8.8, "interim": 2.2},
-        {"trimestre": "T2 2023", "cdi": 74.3, "cdd": 9.0, "interim": 2.1},
-        {"trimestre": "T3 2023", "cdi": 74.4, "cdd": 8.9, "interim": 2.0},
-        {"trimestre": "T4 2023", "cdi": 74.6, "cdd": 8.7, "interim": 2.0},
-        {"trimestre": "T1 2024", "cdi": 74.8, "cdd": 8.5, "interim": 1.9},
-        {"trimestre": "T2 2024", "cdi": 74.7, "cdd": 8.6, "interim": 1.9},
-        {"trimestre": "T3 2024", "cdi": 74.9, "cdd": 8.4, "interim": 1.8},
-        {"trimestre": "T4 2024", "cdi": 75.0, "cdd": 8.3, "interim": 1.8},
-        {"trimestre": "T1 2025", "cdi": 83.6, "cdd": 5.1, "interim": 1.3},
-        {"trimestre": "T2 2025", "cdi": 83.5, "cdd": 5.2, "interim": 1.3},
-        {"trimestre": "T3 2025", "cdi": 83.6, "cdd": 5.1, "interim": 1.3},
-        {"trimestre": "T4 2025", "cdi": 83.4, "cdd": 5.3, "interim": 1.3},
-    ]
-    
     # Récupérer la part CDD+intérim
     data = get_quarterly_values(SERIES_IDS["part_cdd_interim"], 2023)
     
@@ -1035,33 +1617,35 @@ def build_types_contrats_data():
         return result
     
     print("  ⚠️ Utilisation des données par défaut")
-    return default_contrats
+    return [dict(c) for c in DEFAULT_TYPES_CONTRATS]
 
 
 # ============================================================================
 # CONSTRUCTION DES DONNÉES - DIFFICULTÉS RECRUTEMENT (NOUVEAU)
 # ============================================================================
 
+# Repli de build_difficultes_recrutement_data
+DEFAULT_DIFFICULTES_RECRUTEMENT = (
+    {"trimestre": "T1 2023", "industrie": 52, "services": 38, "construction": 65},
+    {"trimestre": "T2 2023", "industrie": 50, "services": 36, "construction": 62},
+    {"trimestre": "T3 2023", "industrie": 48, "services": 35, "construction": 60},
+    {"trimestre": "T4 2023", "industrie": 45, "services": 33, "construction": 58},
+    {"trimestre": "T1 2024", "industrie": 43, "services": 32, "construction": 55},
+    {"trimestre": "T2 2024", "industrie": 41, "services": 30, "construction": 52},
+    {"trimestre": "T3 2024", "industrie": 40, "services": 30, "construction": 50},
+    {"trimestre": "T4 2024", "industrie": 38, "services": 28, "construction": 48},
+    {"trimestre": "T1 2025", "industrie": 36, "services": 27, "construction": 46},
+    {"trimestre": "T2 2025", "industrie": 41, "services": 30, "construction": 49},
+    {"trimestre": "T3 2025", "industrie": 40, "services": 30, "construction": 48},
+    {"trimestre": "T4 2025", "industrie": 38, "services": 28, "construction": 45},
+    {"trimestre": "T1 2026", "industrie": 39, "services": 29, "construction": 46},
+)
+
+
 def build_difficultes_recrutement_data():
     """Construit les données sur les difficultés de recrutement"""
     print("📊 Récupération des difficultés de recrutement...")
     
-    default_difficultes = [
-        {"trimestre": "T1 2023", "industrie": 52, "services": 38, "construction": 65},
-        {"trimestre": "T2 2023", "industrie": 50, "services": 36, "construction": 62},
-        {"trimestre": "T3 2023", "industrie": 48, "services": 35, "construction": 60},
-        {"trimestre": "T4 2023", "industrie": 45, "services": 33, "construction": 58},
-        {"trimestre": "T1 2024", "industrie": 43, "services": 32, "construction": 55},
-        {"trimestre": "T2 2024", "industrie": 41, "services": 30, "construction": 52},
-        {"trimestre": "T3 2024", "industrie": 40, "services": 30, "construction": 50},
-        {"trimestre": "T4 2024", "industrie": 38, "services": 28, "construction": 48},
-        {"trimestre": "T1 2025", "industrie": 36, "services": 27, "construction": 46},
-        {"trimestre": "T2 2025", "industrie": 41, "services": 30, "construction": 49},
-        {"trimestre": "T3 2025", "industrie": 40, "services": 30, "construction": 48},
-        {"trimestre": "T4 2025", "industrie": 38, "services": 28, "construction": 45},
-        {"trimestre": "T1 2026", "industrie": 39, "services": 29, "construction": 46},
-    ]
-    
     data = get_quarterly_values(SERIES_IDS["difficultes_recrutement"], 2023)
     
     if data:
@@ -1080,39 +1664,38 @@ def build_difficultes_recrutement_data():
         return result
     
     print("  ⚠️ Utilisation des données par défaut")
-    return default_difficultes
+    return [dict(d) for d in DEFAULT_DIFFICULTES_RECRUTEMENT]
 
 
 # ============================================================================
 # CONSTRUCTION DES DONNÉES - EMPLOI PAR SECTEUR (NOUVEAU)
 # ============================================================================
 
+# Repli de build_emploi_secteur_data, en milliers d'emplois (base T4 2025)
+DEFAULT_EMPLOI_SECTEURS = (
+    {"secteur": "Tertiaire marchand", "emploi": 12850, "evolution_trim": -0.1, "evolution_an": -0.3},
+    {"secteur": "Tertiaire non marchand", "emploi": 8420, "evolution_trim": 0.3, "evolution_an": 0.8},
+    {"secteur": "Industrie", "emploi": 3180, "evolution_trim": -0.1, "evolution_an": -0.3},
+    {"secteur": "Construction", "emploi": 1530, "evolution_trim": 0.0, "evolution_an": -1.3},
+    {"secteur": "Intérim", "emploi": 700, "evolution_trim": -0.6, "evolution_an": -2.9},
+)
+
+DEFAULT_EMPLOI_EVOLUTION_TRIMESTRIELLE = (
+    {"trimestre": "T1 2024", "industrie": 3210, "construction": 1580, "tertiaire": 21100, "interim": 750},
+    {"trimestre": "T2 2024", "industrie": 3200, "construction": 1560, "tertiaire": 21150, "interim": 730},
+    {"trimestre": "T3 2024", "industrie": 3195, "construction": 1545, "tertiaire": 21180, "interim": 720},
+    {"trimestre": "T4 2024", "industrie": 3190, "construction": 1535, "tertiaire": 21220, "interim": 710},
+    {"trimestre": "T1 2025", "industrie": 3185, "construction": 1530, "tertiaire": 21250, "interim": 705},
+    {"trimestre": "T2 2025", "industrie": 3182, "construction": 1530, "tertiaire": 21270, "interim": 702},
+    {"trimestre": "T3 2025", "industrie": 3180, "construction": 1530, "tertiaire": 21270, "interim": 700},
+    {"trimestre": "T4 2025", "industrie": 3178, "construction": 1528, "tertiaire": 21275, "interim": 698},
+)
+
+
 def build_emploi_secteur_data():
     """Construit les données d'emploi par secteur"""
     print("📊 Récupération de l'emploi par secteur...")
     
-    # Données en milliers d'emplois (base T4 2025)
-    default_secteurs = {
-        "derniere_mise_a_jour": "T4 2025",
-        "secteurs": [
-            {"secteur": "Tertiaire marchand", "emploi": 12850, "evolution_trim": -0.1, "evolution_an": -0.3},
-            {"secteur": "Tertiaire non marchand", "emploi": 8420, "evolution_trim": 0.3, "evolution_an": 0.8},
-            {"secteur": "Industrie", "emploi": 3180, "evolution_trim": -0.1, "evolution_an": -0.3},
-            {"secteur": "Construction", "emploi": 1530, "evolution_trim": 0.0, "evolution_an": -1.3},
-            {"secteur": "Intérim", "emploi": 700, "evolution_trim": -0.6, "evolution_an": -2.9},
-        ],
-        "evolution_trimestrielle": [
-            {"trimestre": "T1 2024", "industrie": 3210, "construction": 1580, "tertiaire": 21100, "interim": 750},
-            {"trimestre": "T2 2024", "industrie": 3200, "construction": 1560, "tertiaire": 21150, "interim": 730},
-            {"trimestre": "T3 2024", "industrie": 3195, "construction": 1545, "tertiaire": 21180, "interim": 720},
-            {"trimestre": "T4 2024", "industrie": 3190, "construction": 1535, "tertiaire": 21220, "interim": 710},
-            {"trimestre": "T1 2025", "industrie": 3185, "construction": 1530, "tertiaire": 21250, "interim": 705},
-            {"trimestre": "T2 2025", "industrie": 3182, "construction": 1530, "tertiaire": 21270, "interim": 702},
-            {"trimestre": "T3 2025", "industrie": 3180, "construction": 1530, "tertiaire": 21270, "interim": 700},
-            {"trimestre": "T4 2025", "industrie": 3178, "construction": 1528, "tertiaire": 21275, "interim": 698},
-        ]
-    }
-    
     # Récupération des 4 secteurs — séries CVS trimestrielles INSEE
     emploi_industrie  = get_quarterly_values(SERIES_IDS["emploi_industrie"],         2023)
     emploi_constr     = get_quarterly_values(SERIES_IDS["emploi_construction"],       2023)
@@ -1152,7 +1735,7 @@ def build_emploi_secteur_data():
                 "interim":      None,
             })
 
-        tnm_last = v_tnm[-1] if v_tnm else default_secteurs["secteurs"][1]["emploi"]
+        tnm_last = v_tnm[-1] if v_tnm else DEFAULT_EMPLOI_SECTEURS[1]["emploi"]
         last_trim = trimestres_hist[-1]["trimestre"] if trimestres_hist else "N/A"
         return {
             "derniere_mise_a_jour": last_trim,
@@ -1168,7 +1751,11 @@ def build_emploi_secteur_data():
     else:
         print("  ⚠️ Emploi secteur : données par défaut")
 
-    return default_secteurs
+    return {
+        "derniere_mise_a_jour": "T4 2025",
+        "secteurs": [dict(e) for e in DEFAULT_EMPLOI_SECTEURS],
+        "evolution_trimestrielle": [dict(e) for e in DEFAULT_EMPLOI_EVOLUTION_TRIMESTRIELLE]
+    }
 
 
 # ============================================================================
@@ -1234,34 +1821,31 @@ def build_tensions_metiers_data():
 # CONSTRUCTION DES DONNÉES - CONDITIONS DE VIE (NOUVEAU)
 # ============================================================================
 
+# Repli de build_irl_data
+DEFAULT_IRL_EVOLUTION = (
+    {"trimestre": "T1 2022", "indice": 133.93, "glissement": 2.48},
+    {"trimestre": "T2 2022", "indice": 135.84, "glissement": 3.60},
+    {"trimestre": "T3 2022", "indice": 136.27, "glissement": 3.49},
+    {"trimestre": "T4 2022", "indice": 137.26, "glissement": 3.50},
+    {"trimestre": "T1 2023", "indice": 138.61, "glissement": 3.49},
+    {"trimestre": "T2 2023", "indice": 140.59, "glissement": 3.50},
+    {"trimestre": "T3 2023", "indice": 141.03, "glissement": 3.49},
+    {"trimestre": "T4 2023", "indice": 142.06, "glissement": 3.50},
+    {"trimestre": "T1 2024", "indice": 143.46, "glissement": 3.50},
+    {"trimestre": "T2 2024", "indice": 145.17, "glissement": 3.26},
+    {"trimestre": "T3 2024", "indice": 144.51, "glissement": 2.47},
+    {"trimestre": "T4 2024", "indice": 144.64, "glissement": 1.82},
+    {"trimestre": "T1 2025", "indice": 145.47, "glissement": 1.40},
+    {"trimestre": "T2 2025", "indice": 146.68, "glissement": 1.04},
+    {"trimestre": "T3 2025", "indice": 145.77, "glissement": 0.87},
+    {"trimestre": "T4 2025", "indice": 145.78, "glissement": 0.79},
+)
+
+
 def build_irl_data():
     """Construit les données IRL (Indice de Référence des Loyers)"""
     print("📊 Récupération de l'IRL...")
     
-    default_irl = {
-        "valeur_actuelle": 145.78,
-        "glissement_annuel": 0.79,
-        "trimestre": "T4 2025",
-        "evolution": [
-            {"trimestre": "T1 2022", "indice": 133.93, "glissement": 2.48},
-            {"trimestre": "T2 2022", "indice": 135.84, "glissement": 3.60},
-            {"trimestre": "T3 2022", "indice": 136.27, "glissement": 3.49},
-            {"trimestre": "T4 2022", "indice": 137.26, "glissement": 3.50},
-            {"trimestre": "T1 2023", "indice": 138.61, "glissement": 3.49},
-            {"trimestre": "T2 2023", "indice": 140.59, "glissement": 3.50},
-            {"trimestre": "T3 2023", "indice": 141.03, "glissement": 3.49},
-            {"trimestre": "T4 2023", "indice": 142.06, "glissement": 3.50},
-            {"trimestre": "T1 2024", "indice": 143.46, "glissement": 3.50},
-            {"trimestre": "T2 2024", "indice": 145.17, "glissement": 3.26},
-            {"trimestre": "T3 2024", "indice": 144.51, "glissement": 2.47},
-            {"trimestre": "T4 2024", "indice": 144.64, "glissement": 1.82},
-            {"trimestre": "T1 2025", "indice": 145.47, "glissement": 1.40},
-            {"trimestre": "T2 2025", "indice": 146.68, "glissement": 1.04},
-            {"trimestre": "T3 2025", "indice": 145.77, "glissement": 0.87},
-            {"trimestre": "T4 2025", "indice": 145.78, "glissement": 0.79},
-        ]
-    }
-    
     data = get_quarterly_values(SERIES_IDS["irl"], 2022)
     glissement = get_quarterly_values(SERIES_IDS["irl_glissement"], 2022)
     
@@ -1286,7 +1870,34 @@ def build_irl_data():
             }
     
     print("  ⚠️ Utilisation des données par défaut")
-    return default_irl
+    return {
+        "valeur_actuelle": 145.78,
+        "glissement_annuel": 0.79,
+        "trimestre": "T4 2025",
+        "evolution": [dict(e) for e in DEFAULT_IRL_EVOLUTION]
+    }
+
+
+# Repli de build_prix_immobilier_data
+DEFAULT_PRIX_IMMO_EVOLUTION = (
+    {"trimestre": "T1 2022", "indice": 124.5, "variation": 7.2},
+    {"trimestre": "T3 2022", "indice": 126.8, "variation": 6.1},
+    {"trimestre": "T1 2023", "indice": 124.2, "variation": -0.2},
+    {"trimestre": "T3 2023", "indice": 120.5, "variation": -5.0},
+    {"trimestre": "T1 2024", "indice": 117.8, "variation": -5.1},
+    {"trimestre": "T3 2024", "indice": 115.3, "variation": -4.3},
+    {"trimestre": "T4 2024", "indice": 126.3, "variation": -1.9},
+    {"trimestre": "T1 2025", "indice": 126.5, "variation": 0.4},
+    {"trimestre": "T2 2025", "indice": 126.5, "variation": 0.6},
+    {"trimestre": "T3 2025", "indice": 128.5, "variation": 0.7},
+)
+
+DEFAULT_PRIX_IMMO_PAR_ZONE = (
+    {"zone": "Paris", "prix_m2": 9450, "variation": -3.2},
+    {"zone": "Île-de-France", "prix_m2": 6220, "variation": -0.3},
+    {"zone": "Province", "prix_m2": 2650, "variation": 1.2},
+    {"zone": "France entière", "prix_m2": 3180, "variation": -0.5},
+)
 
 
 def build_prix_immobilier_data():
@@ -1298,31 +1909,18 @@ def build_prix_immobilier_data():
         "variation_trim": 0.7,
         "variation_an": -1.8,
         "transactions_annuelles": 880000,
-        "evolution": [
-            {"trimestre": "T1 2022", "indice": 124.5, "variation": 7.2},
-            {"trimestre": "T3 2022", "indice": 126.8, "variation": 6.1},
-            {"trimestre": "T1 2023", "indice": 124.2, "variation": -0.2},
-            {"trimestre": "T3 2023", "indice": 120.5, "variation": -5.0},
-            {"trimestre": "T1 2024", "indice": 117.8, "variation": -5.1},
-            {"trimestre": "T3 2024", "indice": 115.3, "variation": -4.3},
-            {"trimestre": "T4 2024", "indice": 126.3, "variation": -1.9},
-            {"trimestre": "T1 2025", "indice": 126.5, "variation": 0.4},
-            {"trimestre": "T2 2025", "indice": 126.5, "variation": 0.6},
-            {"trimestre": "T3 2025", "indice": 128.5, "variation": 0.7},
-        ],
-        "par_zone": [
-            {"zone": "Paris", "prix_m2": 9450, "variation": -3.2},
-            {"zone": "Île-de-France", "prix_m2": 6220, "variation": -0.3},
-            {"zone": "Province", "prix_m2": 2650, "variation": 1.2},
-            {"zone": "France entière", "prix_m2": 3180, "variation": -0.5},
-        ]
+        "evolution": [dict(e) for e in DEFAULT_PRIX_IMMO_EVOLUTION],
+        "par_zone": [dict(z) for z in DEFAULT_PRIX_IMMO_PAR_ZONE]
     }
     
     data = get_quarterly_values(SERIES_IDS["prix_immobilier"], 2022)
     
     if data:
+        # Seuls les 8 derniers trimestres (2 ans) sont publiés : les variations sur
+        # 4 trimestres ne sont calculées que pour eux
         evolution = []
-        for i, d in enumerate(data):
+        for i in range(max(len(data) - 8, 0), len(data)):
+            d = data[i]
             variation = 0
             if i >= 4:
                 prev = data[i-4]['valeur']
@@ -1333,18 +1931,62 @@ def build_prix_immobilier_data():
                 "variation": variation
             })
         
-        if evolution:
-            latest = evolution[-1]
-            print(f"  ✓ {len(evolution)} trimestres prix immo récupérés")
-            default_immo['indice_actuel'] = latest['indice']
-            default_immo['variation_an'] = latest['variation']
-            default_immo['evolution'] = evolution[-8:]  # 2 ans
+        latest = evolution[-1]
+        print(f"  ✓ {len(data)} trimestres prix immo récupérés")
+        default_immo['indice_actuel'] = latest['indice']
+        default_immo['variation_an'] = latest['variation']
+        default_immo['evolution'] = evolution
     else:
         print("  ⚠️ Utilisation des données par défaut")
     
     return default_immo
 
 
+# ── BASE STATIQUE — toujours présente pour garantir la courbe ──
+# Historique mensuel 2023-2026 (moyenne nationale constatée)
+CARBURANTS_HISTORIQUE_STATIQUE = (
+    {"date": "2023-01-01", "gazole": 1.850, "sp95": 1.820, "sp98": 1.920, "e10": 1.790},
+    {"date": "2023-02-01", "gazole": 1.840, "sp95": 1.830, "sp98": 1.930, "e10": 1.800},
+    {"date": "2023-03-01", "gazole": 1.820, "sp95": 1.860, "sp98": 1.960, "e10": 1.820},
+    {"date": "2023-04-01", "gazole": 1.780, "sp95": 1.880, "sp98": 1.980, "e10": 1.840},
+    {"date": "2023-05-01", "gazole": 1.740, "sp95": 1.870, "sp98": 1.970, "e10": 1.830},
+    {"date": "2023-06-01", "gazole": 1.700, "sp95": 1.840, "sp98": 1.940, "e10": 1.800},
+    {"date": "2023-07-01", "gazole": 1.720, "sp95": 1.850, "sp98": 1.950, "e10": 1.810},
+    {"date": "2023-08-01", "gazole": 1.760, "sp95": 1.870, "sp98": 1.970, "e10": 1.830},
+    {"date": "2023-09-01", "gazole": 1.830, "sp95": 1.900, "sp98": 2.000, "e10": 1.860},
+    {"date": "2023-10-01", "gazole": 1.880, "sp95": 1.920, "sp98": 2.020, "e10": 1.880},
+    {"date": "2023-11-01", "gazole": 1.790, "sp95": 1.890, "sp98": 1.990, "e10": 1.850},
+    {"date": "2023-12-01", "gazole": 1.730, "sp95": 1.840, "sp98": 1.940, "e10": 1.800},
+    {"date": "2024-01-01", "gazole": 1.720, "sp95": 1.780, "sp98": 1.880, "e10": 1.740},
+    {"date": "2024-02-01", "gazole": 1.730, "sp95": 1.790, "sp98": 1.890, "e10": 1.750},
+    {"date": "2024-03-01", "gazole": 1.740, "sp95": 1.800, "sp98": 1.900, "e10": 1.760},
+    {"date": "2024-04-01", "gazole": 1.750, "sp95": 1.820, "sp98": 1.920, "e10": 1.780},
+    {"date": "2024-05-01", "gazole": 1.740, "sp95": 1.820, "sp98": 1.920, "e10": 1.780},
+    {"date": "2024-06-01", "gazole": 1.720, "sp95": 1.800, "sp98": 1.900, "e10": 1.760},
+    {"date": "2024-07-01", "gazole": 1.680, "sp95": 1.750, "sp98": 1.850, "e10": 1.710},
+    {"date": "2024-08-01", "gazole": 1.660, "sp95": 1.740, "sp98": 1.840, "e10": 1.700},
+    {"date": "2024-09-01", "gazole": 1.640, "sp95": 1.730, "sp98": 1.830, "e10": 1.690},
+    {"date": "2024-10-01", "gazole": 1.620, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2024-11-01", "gazole": 1.610, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
+    {"date": "2024-12-01", "gazole": 1.620, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2025-01-01", "gazole": 1.650, "sp95": 1.780, "sp98": 1.880, "e10": 1.740},
+    {"date": "2025-02-01", "gazole": 1.640, "sp95": 1.770, "sp98": 1.870, "e10": 1.730},
+    {"date": "2025-03-01", "gazole": 1.630, "sp95": 1.760, "sp98": 1.860, "e10": 1.720},
+    {"date": "2025-04-01", "gazole": 1.600, "sp95": 1.740, "sp98": 1.840, "e10": 1.700},
+    {"date": "2025-05-01", "gazole": 1.590, "sp95": 1.730, "sp98": 1.830, "e10": 1.690},
+    {"date": "2025-06-01", "gazole": 1.580, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2025-07-01", "gazole": 1.580, "sp95": 1.700, "sp98": 1.800, "e10": 1.660},
+    {"date": "2025-08-01", "gazole": 1.580, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
+    {"date": "2025-09-01", "gazole": 1.590, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2025-10-01", "gazole": 1.580, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2025-11-01", "gazole": 1.590, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2025-12-01", "gazole": 1.600, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
+    {"date": "2026-01-01", "gazole": 1.620, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
+    {"date": "2026-02-01", "gazole": 1.640, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+    {"date": "2026-03-01", "gazole": 1.650, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
+)
+
+
 def build_carburants_data():
     """
     Construit les données prix carburants avec historique QUOTIDIEN.
@@ -1373,56 +2015,10 @@ def build_carburants_data():
             return None
 
     def api_get(url):
-        req = urllib.request.Request(url, headers={'User-Agent': 'CFTC-Dashboard/2.0', 'Accept': 'application/json'})
-        with urllib.request.urlopen(req, timeout=20) as r:
-            return json.loads(r.read().decode('utf-8'))
-
-    # ── BASE STATIQUE — toujours présente pour garantir la courbe ──
-    # Historique mensuel 2023-2026 (moyenne nationale constatée)
-    historique_statique = [
-        {"date": "2023-01-01", "gazole": 1.850, "sp95": 1.820, "sp98": 1.920, "e10": 1.790},
-        {"date": "2023-02-01", "gazole": 1.840, "sp95": 1.830, "sp98": 1.930, "e10": 1.800},
-        {"date": "2023-03-01", "gazole": 1.820, "sp95": 1.860, "sp98": 1.960, "e10": 1.820},
-        {"date": "2023-04-01", "gazole": 1.780, "sp95": 1.880, "sp98": 1.980, "e10": 1.840},
-        {"date": "2023-05-01", "gazole": 1.740, "sp95": 1.870, "sp98": 1.970, "e10": 1.830},
-        {"date": "2023-06-01", "gazole": 1.700, "sp95": 1.840, "sp98": 1.940, "e10": 1.800},
-        {"date": "2023-07-01", "gazole": 1.720, "sp95": 1.850, "sp98": 1.950, "e10": 1.810},
-        {"date": "2023-08-01", "gazole": 1.760, "sp95": 1.870, "sp98": 1.970, "e10": 1.830},
-        {"date": "2023-09-01", "gazole": 1.830, "sp95": 1.900, "sp98": 2.000, "e10": 1.860},
-        {"date": "2023-10-01", "gazole": 1.880, "sp95": 1.920, "sp98": 2.020, "e10": 1.880},
-        {"date": "2023-11-01", "gazole": 1.790, "sp95": 1.890, "sp98": 1.990, "e10": 1.850},
-        {"date": "2023-12-01", "gazole": 1.730, "sp95": 1.840, "sp98": 1.940, "e10": 1.800},
-        {"date": "2024-01-01", "gazole": 1.720, "sp95": 1.780, "sp98": 1.880, "e10": 1.740},
-        {"date": "2024-02-01", "gazole": 1.730, "sp95": 1.790, "sp98": 1.890, "e10": 1.750},
-        {"date": "2024-03-01", "gazole": 1.740, "sp95": 1.800, "sp98": 1.900, "e10": 1.760},
-        {"date": "2024-04-01", "gazole": 1.750, "sp95": 1.820, "sp98": 1.920, "e10": 1.780},
-        {"date": "2024-05-01", "gazole": 1.740, "sp95": 1.820, "sp98": 1.920, "e10": 1.780},
-        {"date": "2024-06-01", "gazole": 1.720, "sp95": 1.800, "sp98": 1.900, "e10": 1.760},
-        {"date": "2024-07-01", "gazole": 1.680, "sp95": 1.750, "sp98": 1.850, "e10": 1.710},
-        {"date": "2024-08-01", "gazole": 1.660, "sp95": 1.740, "sp98": 1.840, "e10": 1.700},
-        {"date": "2024-09-01", "gazole": 1.640, "sp95": 1.730, "sp98": 1.830, "e10": 1.690},
-        {"date": "2024-10-01", "gazole": 1.620, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2024-11-01", "gazole": 1.610, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
-        {"date": "2024-12-01", "gazole": 1.620, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2025-01-01", "gazole": 1.650, "sp95": 1.780, "sp98": 1.880, "e10": 1.740},
-        {"date": "2025-02-01", "gazole": 1.640, "sp95": 1.770, "sp98": 1.870, "e10": 1.730},
-        {"date": "2025-03-01", "gazole": 1.630, "sp95": 1.760, "sp98": 1.860, "e10": 1.720},
-        {"date": "2025-04-01", "gazole": 1.600, "sp95": 1.740, "sp98": 1.840, "e10": 1.700},
-        {"date": "2025-05-01", "gazole": 1.590, "sp95": 1.730, "sp98": 1.830, "e10": 1.690},
-        {"date": "2025-06-01", "gazole": 1.580, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2025-07-01", "gazole": 1.580, "sp95": 1.700, "sp98": 1.800, "e10": 1.660},
-        {"date": "2025-08-01", "gazole": 1.580, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
-        {"date": "2025-09-01", "gazole": 1.590, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2025-10-01", "gazole": 1.580, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2025-11-01", "gazole": 1.590, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2025-12-01", "gazole": 1.600, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
-        {"date": "2026-01-01", "gazole": 1.620, "sp95": 1.710, "sp98": 1.810, "e10": 1.670},
-        {"date": "2026-02-01", "gazole": 1.640, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-        {"date": "2026-03-01", "gazole": 1.650, "sp95": 1.720, "sp98": 1.820, "e10": 1.680},
-    ]
+        return loads_json(http_get(url, {'User-Agent': 'CFTC-Dashboard/2.0', 'Accept': 'application/json'}, 20))
 
-    # Dictionnaire date → point pour fusion rapide
-    evolution_dict = {p['date']: dict(p) for p in historique_statique}
+    # Dictionnaire date → point pour fusion rapide (copie de la base statique)
+    evolution_dict = {p['date']: dict(p) for p in CARBURANTS_HISTORIQUE_STATIQUE}
     source_historique = "Valeurs statiques (base mensuelle)"
     granularite = "mensuel"
 
@@ -1538,7 +2134,7 @@ def build_carburants_data():
             print(f"  ⚠️ INSEE indisponible: {e}")
 
     # ── ASSEMBLAGE FINAL ────────────────────────────────────────────
-    evolution = sorted(evolution_dict.values(), key=lambda x: x['date'])
+    evolution = sorted(evolution_dict.values(), key=itemgetter('date'))
 
     dernier = evolution[-1]
     prix_sp95   = prix_jour.get('sp95')   or dernier.get('sp95')   or 1.720
@@ -1746,13 +2342,8 @@ def build_climat_affaires_data():
         for c in climat:
             period = c['period']
             if period in menages_dict:
-                year, month = period.split('-')
-                mois_fr = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", 
-                          "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
-                mois_label = f"{mois_fr[int(month)-1]} {year}"
-                
                 evolution.append({
-                    "mois": mois_label,
+                    "mois": format_mois(period),
                     "climat": round(c['value']),
                     "menages": round(menages_dict[period])
                 })
@@ -1816,14 +2407,8 @@ def build_defaillances_data():
     if data:
         evolution = []
         for d in data:
-            period = d['period']
-            year, month = period.split('-')
-            mois_fr = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", 
-                      "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
-            mois_label = f"{mois_fr[int(month)-1]} {year}"
-            
             evolution.append({
-                "mois": mois_label,
+                "mois": format_mois(d['period']),
                 "cumul": round(d['value'])
             })
         
@@ -1890,44 +2475,65 @@ def build_investissement_data():
 # CONSTRUCTION DES DONNÉES - SALAIRES
 # ============================================================================
 
+def calc_evolution(data):
+    """Évolution (%) entre la dernière valeur trimestrielle et data[-4]."""
+    if len(data) >= 4:
+        latest = data[-1]['valeur']
+        year_ago = data[-4]['valeur']
+        return round(((latest / year_ago) - 1) * 100, 1)
+    return 0.0
+
+
+# Repli de build_salaires_secteur_data (évolutions mises à jour depuis les indices SMB)
+DEFAULT_SALAIRES_SECTEUR = (
+    {"secteur": "Services financiers", "salaire": 4123, "evolution": 0.5},
+    {"secteur": "Info-communication", "salaire": 3853, "evolution": 0.8},
+    {"secteur": "Industrie", "salaire": 3021, "evolution": 1.1},
+    {"secteur": "Tertiaire (moyenne)", "salaire": 2705, "evolution": 0.7},
+    {"secteur": "Construction", "salaire": 2411, "evolution": 0.4},
+    {"secteur": "Héberg.-restauration", "salaire": 1979, "evolution": 0.9},
+)
+
+
 def build_salaires_secteur_data():
     """Construit les données de salaires par secteur"""
     print("📊 Récupération des indices SMB par secteur...")
     
-    default_secteurs = [
-        {"secteur": "Services financiers", "salaire": 4123, "evolution": 0.5},
-        {"secteur": "Info-communication", "salaire": 3853, "evolution": 0.8},
-        {"secteur": "Industrie", "salaire": 3021, "evolution": 1.1},
-        {"secteur": "Tertiaire (moyenne)", "salaire": 2705, "evolution": 0.7},
-        {"secteur": "Construction", "salaire": 2411, "evolution": 0.4},
-        {"secteur": "Héberg.-restauration", "salaire": 1979, "evolution": 0.9},
-    ]
-    
     smb_industrie = get_quarterly_values(SERIES_IDS["smb_industrie"], 2023)
     smb_construction = get_quarterly_values(SERIES_IDS["smb_construction"], 2023)
     smb_tertiaire = get_quarterly_values(SERIES_IDS["smb_tertiaire"], 2023)
     
+    # Copie des lignes : les évolutions sont mises à jour en place
+    secteurs = [dict(s) for s in DEFAULT_SALAIRES_SECTEUR]
     if smb_industrie and len(smb_industrie) >= 4:
-        def calc_evolution(data):
-            if len(data) >= 4:
-                latest = data[-1]['valeur']
-                year_ago = data[-4]['valeur']
-                return round(((latest / year_ago) - 1) * 100, 1)
-            return 0.0
-        
-        for s in default_secteurs:
-            if s['secteur'] == 'Industrie':
-                s['evolution'] = calc_evolution(smb_industrie)
-            elif s['secteur'] == 'Construction':
-                s['evolution'] = calc_evolution(smb_construction)
-            elif s['secteur'] == 'Tertiaire (moyenne)':
-                s['evolution'] = calc_evolution(smb_tertiaire)
+        # Secteur → indice SMB correspondant (les autres gardent leur évolution par défaut)
+        smb_par_secteur = {
+            'Industrie': smb_industrie,
+            'Construction': smb_construction,
+            'Tertiaire (moyenne)': smb_tertiaire,
+        }
+        for s in secteurs:
+            smb = smb_par_secteur.get(s['secteur'])
+            if smb is not None:
+                s['evolution'] = calc_evolution(smb)
         
         print(f"  ✓ Évolutions SMB mises à jour")
     else:
         print("  ⚠️ Utilisation des évolutions par défaut")
     
-    return default_secteurs
+    return secteurs
+
+
+# Repli de build_ecart_hf_data
+DEFAULT_ECART_HF_EVOLUTION = (
+    {"annee": "2015", "ecart": 18.4},
+    {"annee": "2017", "ecart": 16.6},
+    {"annee": "2019", "ecart": 16.1},
+    {"annee": "2021", "ecart": 15.5},
+    {"annee": "2022", "ecart": 14.9},
+    {"annee": "2023", "ecart": 14.2},
+    {"annee": "2024", "ecart": 14.0},
+)
 
 
 def build_ecart_hf_data():
@@ -1940,16 +2546,6 @@ def build_ecart_hf_data():
     """
     print("📊 Récupération des données écart H/F...")
     
-    default_evolution = [
-        {"annee": "2015", "ecart": 18.4},
-        {"annee": "2017", "ecart": 16.6},
-        {"annee": "2019", "ecart": 16.1},
-        {"annee": "2021", "ecart": 15.5},
-        {"annee": "2022", "ecart": 14.9},
-        {"annee": "2023", "ecart": 14.2},
-        {"annee": "2024", "ecart": 14.0},
-    ]
-    
     salaires_femmes = get_annual_values(SERIES_IDS["salaire_net_femmes"], 2015)
     salaires_hommes = get_annual_values(SERIES_IDS["salaire_net_hommes"], 2015)
     
@@ -1965,7 +2561,7 @@ def build_ecart_hf_data():
         
         if evolution:
             print(f"  ✓ {len(evolution)} années d'écart H/F récupérées")
-            evolution = evolution[-7:] if len(evolution) > 7 else evolution
+            evolution = evolution[-7:]
             return {
                 "ecart_global": 21.8,
                 "ecart_eqtp": evolution[-1]['ecart'] if evolution else 14.0,
@@ -1978,7 +2574,7 @@ def build_ecart_hf_data():
         "ecart_global": 21.8,
         "ecart_eqtp": 14.0,
         "ecart_poste_comparable": 4.0,
-        "evolution": default_evolution
+        "evolution": [dict(e) for e in DEFAULT_ECART_HF_EVOLUTION]
     }
 
 
@@ -2207,23 +2803,21 @@ def fetch_prix_carburants_api():
     """
     try:
         url = "https://data.economie.gouv.fr/api/explore/v2.1/catalog/datasets/prix-des-carburants-en-france-flux-instantane-v2/records?select=avg(sp95_prix)%20as%20prix_moyen&limit=1"
-        req = urllib.request.Request(url, headers={'User-Agent': 'CFTC-Dashboard/2.0'})
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode('utf-8'))
-            if data.get('results') and len(data['results']) > 0:
-                prix = data['results'][0].get('prix_moyen')
-                if prix:
-                    # L'API retourne en millièmes si > 100, en euros sinon
-                    if prix > 100:
-                        prix_final = round(prix / 1000, 3)
-                    else:
-                        prix_final = round(prix, 3)
-                    # Sanity check : un prix essence en France doit être entre 1.0 et 3.0 €/L
-                    if 1.0 <= prix_final <= 3.0:
-                        return prix_final
-                    else:
-                        print(f"   ⚠️  Prix essence API hors plage ({prix_final}€/L), ignoré")
-                        return None
+        data = loads_json(http_get(url, {'User-Agent': 'CFTC-Dashboard/2.0'}, 10))
+        if data.get('results') and len(data['results']) > 0:
+            prix = data['results'][0].get('prix_moyen')
+            if prix:
+                # L'API retourne en millièmes si > 100, en euros sinon
+                if prix > 100:
+                    prix_final = round(prix / 1000, 3)
+                else:
+                    prix_final = round(prix, 3)
+                # Sanity check : un prix essence en France doit être entre 1.0 et 3.0 €/L
+                if 1.0 <= prix_final <= 3.0:
+                    return prix_final
+                else:
+                    print(f"   ⚠️  Prix essence API hors plage ({prix_final}€/L), ignoré")
+                    return None
     except Exception as e:
         print(f"   ⚠️  Erreur API carburants: {e}")
     return None
@@ -2724,7 +3318,7 @@ def build_alertes_automatiques(data_actuelle):
     })
     
     # Trier par date décroissante et limiter à 10 alertes max
-    alertes = sorted(alertes, key=lambda x: x['date'], reverse=True)[:10]
+    alertes = heapq.nlargest(10, alertes, key=itemgetter('date'))
     
     return alertes
 
@@ -2964,7 +3558,7 @@ def build_marches_financiers_data():
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range={period}&interval={interval}"
             headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
             resp = safe_urlopen(url, headers=headers, timeout=20)
-            data = json.loads(resp.read().decode("utf-8"))
+            data = loads_json(resp.read())
             result = data["chart"]["result"][0]
             timestamps = result["timestamp"]
             closes = result["indicators"]["quote"][0]["close"]
@@ -3160,7 +3754,7 @@ def build_marches_financiers_data():
             print("    -> Brent : fallback EIA API v2...")
             eia_url = "https://api.eia.gov/v2/petroleum/pri/spt/data/?api_key=DEMO_KEY&frequency=daily&data[0]=value&facets[series][]=RBRTE&sort[0][column]=period&sort[0][direction]=desc&length=365"
             resp = safe_urlopen(eia_url, timeout=15)
-            eia_result = json.loads(resp.read().decode("utf-8"))
+            eia_result = loads_json(resp.read())
             if "response" in eia_result and "data" in eia_result["response"]:
                 for item in reversed(eia_result["response"]["data"]):
                     try:
@@ -3931,6 +4525,8 @@ from copy import deepcopy
 
 KALI_INDEX_URL = "https://raw.githubusercontent.com/SocialGouv/kali-data/master/data/index.json"
 KALI_DATA_RAW_BASE = "https://raw.githubusercontent.com/SocialGouv/kali-data/master/data"
+# Téléchargements simultanés des JSON de conventions (un fichier par CCN)
+KALI_MAX_WORKERS = 8
 
 SALAIRE_ARTICLE_HINTS = [
     "salaire minimum",
@@ -3967,26 +4563,24 @@ def normalize_text(text):
     return text
 
 def safe_get_json(url, timeout=30, headers=None):
-    req = urllib.request.Request(
+    return loads_json(http_get(
         url,
-        headers=headers or {
+        headers or {
             "Accept": "application/json",
             "User-Agent": "CFTC-Dashboard/3.0",
         },
-    )
-    with urllib.request.urlopen(req, timeout=timeout) as response:
-        return json.loads(response.read().decode("utf-8"))
+        timeout,
+    ))
 
 def safe_get_text(url, timeout=30, headers=None):
-    req = urllib.request.Request(
+    return http_get(
         url,
-        headers=headers or {
+        headers or {
             "Accept": "application/json",
             "User-Agent": "CFTC-Dashboard/3.0",
         },
-    )
-    with urllib.request.urlopen(req, timeout=timeout) as response:
-        return response.read().decode("utf-8")
+        timeout,
+    ).decode("utf-8")
 
 def to_number(value):
     if value is None:
@@ -4344,7 +4938,8 @@ def build_conventions_collectives_enrichies(smic_net, smic_brut):
     nb_verify = 0
     nb_non_conforme = 0
 
-    for idcc, kali_entry in kali_index.items():
+    def enrich(item):
+        idcc, kali_entry = item
         # Construire la base depuis l'index (sans saisie manuelle)
         base = {
             "idcc":  idcc,
@@ -4357,8 +4952,13 @@ def build_conventions_collectives_enrichies(smic_net, smic_brut):
                        f"https://www.legifrance.gouv.fr/search/result?query=idcc+{idcc}"),
             "meta": {},
         }
+        return enrich_branch_from_kali(base, kali_entry, smic_net)
 
-        enriched = enrich_branch_from_kali(base, kali_entry, smic_net)
+    # Un téléchargement par CCN : en parallèle, résultats dans l'ordre de l'index
+    with ThreadPoolExecutor(max_workers=KALI_MAX_WORKERS) as executor:
+        enriched_branches = list(executor.map(enrich, kali_index.items()))
+
+    for enriched in enriched_branches:
         branches.append(enriched)
 
         statut = enriched["statut"]
@@ -4822,11 +5422,9 @@ def fetch_eurostat_pct_pib(na_item, start_year=2010):
     )
     _time.sleep(0.5)
     try:
-        req = urllib.request.Request(url, headers={
+        data = loads_json(http_get(url, {
             "Accept": "application/json", "User-Agent": "CFTC-Dashboard/2.0"
-        })
-        with urllib.request.urlopen(req, timeout=20) as r:
-            data = json.loads(r.read())
+        }, 20))
         time_idx = data.get("dimension",{}).get("time",{}).get("category",{}).get("index",{})
         values   = data.get("value", {})
         result   = []
@@ -4855,11 +5453,9 @@ def fetch_eurostat_cofog(cofog_code, start_year=2010):
     )
     _time.sleep(0.5)
     try:
-        req = urllib.request.Request(url, headers={
+        data = loads_json(http_get(url, {
             "Accept": "application/json", "User-Agent": "CFTC-Dashboard/2.0"
-        })
-        with urllib.request.urlopen(req, timeout=20) as r:
-            data = json.loads(r.read())
+        }, 20))
         time_idx = data.get("dimension",{}).get("time",{}).get("category",{}).get("index",{})
         values   = data.get("value", {})
         result   = []
@@ -4885,9 +5481,7 @@ def fetch_fred_series(series_id, label, start_date="2010-01-01"):
     url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}&cosd={start_date}"
     _time.sleep(0.3)
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "CFTC-Dashboard/2.0"})
-        with urllib.request.urlopen(req, timeout=15) as r:
-            lines = r.read().decode("utf-8").strip().split("\n")
+        lines = http_get(url, {"User-Agent": "CFTC-Dashboard/2.0"}, 15).decode("utf-8").strip().split("\n")
         result = []
         for line in lines[1:]:  # skip header
             parts = line.strip().split(",")
@@ -5121,7 +5715,15 @@ def build_finances_publiques_data():
         "source": f"Eurostat gov_10dd_edpt1 • FRED GGGDTAFRA188N — {source_str}"
     }
 
-def main():
+def main(cache_ttl=None):
+    """
+    Met à jour public/data.json.
+    cache_ttl : durée de validité (s) du cache disque INSEE, 0 pour le désactiver ;
+    par défaut INSEE_CACHE_TTL (variable d'environnement).
+    """
+    global _insee_cache_ttl
+    _insee_cache_ttl = INSEE_CACHE_TTL if cache_ttl is None else cache_ttl
+
     print("=" * 70)
     print("🔄 MISE À JOUR DES DONNÉES ÉCONOMIQUES - CFTC v2.0")
     print(f"   {datetime.now().strftime('%d/%m/%Y %H:%M')}")
@@ -5134,6 +5736,8 @@ def main():
     print("📡 DONNÉES AUTOMATIQUES (API INSEE)")
     print("━" * 70)
 
+    start_insee_prefetch(INSEE_PREFETCH)
+
     finances_publiques = build_finances_publiques_data()
     inflation_salaires = build_inflation_data()
     chomage = build_chomage_data()
@@ -5296,10 +5900,11 @@ def main():
     alertes_auto = build_alertes_automatiques(data_pour_alertes)
     changelog = build_changelog()
     revue_presse = build_revue_presse()
-    # Assembler le JSON final
+    # Assembler le JSON final (un seul instant pour les deux horodatages)
+    updated_at = datetime.now()
     data = {
-        "last_updated": datetime.now().strftime("%d/%m/%Y %H:%M"),
-        "last_updated_iso": datetime.now().isoformat(),
+        "last_updated": updated_at.strftime("%d/%m/%Y %H:%M"),
+        "last_updated_iso": updated_at.isoformat(),
         "contact": "hspringragain@cftc.fr",
         "alertes": alertes_auto,
         "changelog": changelog,
@@ -6135,14 +6740,25 @@ def main():
         print("  ⚠️ Chômage DROM : API indisponible, valeurs statiques conservées")
 
     # Écrire le fichier JSON
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(script_dir, '..', 'public', 'data.json')
-    output_path = os.path.abspath(output_path)
+    output_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'public', 'data.json'))
     
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Écriture dans un fichier temporaire puis renommage atomique : un run interrompu
+    # ne laisse jamais un data.json tronqué que le dashboard ne saurait pas lire.
+    # En cas d'échec le .tmp est supprimé (public/ est déployé et commité par la CI)
+    payload = dumps_json(data)
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
     
     print()
     print("=" * 70)
@@ -6189,5 +6805,14 @@ def main():
     print()
 
 
+def parse_args(argv=None):
+    """Options de la ligne de commande (les options inconnues sont refusées)."""
+    parser = argparse.ArgumentParser(description="Mise à jour de public/data.json")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ni lecture ni écriture du cache disque INSEE (comme INSEE_CACHE_TTL=0)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(cache_ttl=0 if args.no_cache else None)